@@ -0,0 +1,33 @@
+import subprocess
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def summarize(latencies_ms) -> dict:
+    """지연 시간(ms) 목록 → p50 / p95 / p99 / 평균 / 최대"""
+    if not latencies_ms:
+        return {}
+    return {
+        "p50": round(percentile(latencies_ms, 0.50), 2),
+        "p95": round(percentile(latencies_ms, 0.95), 2),
+        "p99": round(percentile(latencies_ms, 0.99), 2),
+        "mean": round(sum(latencies_ms) / len(latencies_ms), 2),
+        "max": round(max(latencies_ms), 2),
+    }
+
+
+def git_commit() -> str:
+    """리포트를 커밋끼리 비교할 수 있도록 현재 커밋 해시"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
@@ -0,0 +1,216 @@
+"""
+crud 함수 대용량 벤치마크 + 쿼리 플랜 회귀 검사
+
+    cd backend
+    python -m benchmarks.generate_data --movies 10000 --reviews 5000000 --reset
+    python -m benchmarks.crud_scale --repeat 20
+
+- 각 crud 함수를 반복 호출해 p50/p95/p99(ms) 측정 (delete_movie는 세이브포인트 안에서 실행 후 롤백)
+- SQLite면 각 함수가 실행한 쿼리를 EXPLAIN QUERY PLAN으로 확인해
+  테이블 전체 스캔(SCAN <table>, 인덱스 없이)이나 임시 B-tree 정렬(USE TEMP B-TREE)이 있으면 exit 1
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from benchmarks.common import git_commit, summarize
+from benchmarks.generate_data import DEFAULT_DATABASE_URL
+
+# 결과 전체를 돌려주는 조회라 전체 스캔이 의도된 테이블
+ALLOWED_SCANS = {
+    "get_movies": {"movies"},
+    # 최신순 첫 페이지는 rowid 역순으로 읽다가 LIMIT에서 멈춤 (플랜에는 SCAN movies로 표시)
+    "get_catalog": {"movies"},
+}
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?!.* USING )")
+
+
+def plan_problems(detail: str, allowed_scans=()) -> list:
+    problems = []
+    if "USE TEMP B-TREE" in detail:
+        problems.append("임시 B-tree 정렬")
+    match = FULL_SCAN.match(detail)
+    if match and match.group(1) not in allowed_scans:
+        problems.append(f"{match.group(1)} 전체 스캔")
+    return problems
+
+
+class StatementRecorder:
+    """엔진에서 실행된 SELECT / UPDATE / DELETE 문과 파라미터 기록"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.statements = []
+        self.active = False
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            params = parameters[0] if executemany else parameters
+            if (statement, params) not in self.statements:
+                self.statements.append((statement, params))
+
+
+def _rollback_engine(url: str):
+    """
+    세이브포인트 롤백이 실제로 동작하는 벤치마크 전용 엔진
+    - pysqlite는 BEGIN을 직접 관리해 SAVEPOINT가 바깥 트랜잭션에 묶이지 않으므로
+      SQLAlchemy 문서의 우회 방법대로 BEGIN을 직접 보냄
+    """
+    from sqlalchemy import create_engine, event
+
+    from database import engine_options, is_sqlite, set_sqlite_pragmas
+
+    bench_engine = create_engine(url, **engine_options(url))
+    if is_sqlite(url):
+        @event.listens_for(bench_engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            set_sqlite_pragmas(dbapi_connection, connection_record)
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(bench_engine, "begin")
+        def on_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+    return bench_engine
+
+
+def explain(engine, statements, allowed_scans) -> list:
+    """쿼리별 플랜 + 문제점"""
+    results = []
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for statement, params in statements:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", params)
+            details = [row[-1] for row in cursor.fetchall()]
+            problems = [p for detail in details for p in plan_problems(detail, allowed_scans)]
+            results.append({
+                "sql": " ".join(statement.split())[:200],
+                "plan": details,
+                "problems": problems,
+            })
+    finally:
+        raw.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--deep-pages", type=int, default=50, help="깊은 페이지 측정 전 넘길 페이지 수")
+    parser.add_argument("--output", help="리포트를 저장할 JSON 파일 (기본: 표준 출력)")
+    args = parser.parse_args()
+
+    # database 모듈이 import 시점에 엔진을 만들므로 먼저 지정
+    os.environ["DATABASE_URL"] = args.database_url
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import Session
+
+    import crud
+    from database import is_sqlite
+    from models import Movie, Review
+
+    engine = _rollback_engine(args.database_url)
+    with Session(bind=engine) as db:
+        movie_count = db.scalar(select(func.count()).select_from(Movie))
+        review_count = db.scalar(select(func.count()).select_from(Review))
+        if not movie_count:
+            raise SystemExit("데이터가 없습니다. benchmarks.generate_data로 먼저 적재하세요.")
+
+        # 리뷰가 가장 많은 영화 / 중간 영화
+        by_reviews = db.execute(
+            select(Movie.id).order_by(Movie.review_count.desc(), Movie.id)
+        ).scalars().all()
+        popular_id, median_id = by_reviews[0], by_reviews[len(by_reviews) // 2]
+
+        def deep_cursor(fetch):
+            after = None
+            for _ in range(args.deep_pages):
+                page = fetch(after)
+                if not page["next_cursor"]:
+                    break
+                after = page["next_cursor"]
+            return after
+
+        popular_deep = deep_cursor(lambda after: crud.get_reviews_by_movie(db, popular_id, 10, after))
+        recent_deep = deep_cursor(lambda after: crud.get_recent_reviews(db, 10, after))
+        catalog_deep = {
+            sort: deep_cursor(lambda after, sort=sort: crud.get_catalog(db, sort, 30, after))
+            for sort in crud.CATALOG_SORTS
+        }
+
+    def run_delete(db):
+        crud.delete_movie(db, popular_id)
+
+    scenarios = {
+        "get_movies": lambda db: crud.get_movies(db),
+        "get_reviews_by_movie[popular]": lambda db: crud.get_reviews_by_movie(db, popular_id, 10),
+        "get_reviews_by_movie[popular,deep]": lambda db: crud.get_reviews_by_movie(db, popular_id, 10, popular_deep),
+        "get_reviews_by_movie[median]": lambda db: crud.get_reviews_by_movie(db, median_id, 10),
+        "get_recent_reviews": lambda db: crud.get_recent_reviews(db, 10),
+        "get_recent_reviews[deep]": lambda db: crud.get_recent_reviews(db, 10, recent_deep),
+        "delete_movie[popular]": run_delete,
+    }
+    for sort in crud.CATALOG_SORTS:
+        scenarios[f"get_catalog[{sort}]"] = lambda db, sort=sort: crud.get_catalog(db, sort, 30)
+        scenarios[f"get_catalog[{sort},deep]"] = (
+            lambda db, sort=sort: crud.get_catalog(db, sort, 30, catalog_deep[sort])
+        )
+
+    recorder = StatementRecorder(engine)
+    check_plans = is_sqlite(args.database_url)
+    report = {}
+    failed = False
+
+    for name, fn in scenarios.items():
+        latencies = []
+        recorder.statements = []
+        for i in range(args.repeat):
+            # 삭제도 되돌릴 수 있도록 바깥 트랜잭션 + 세이브포인트 안에서 실행
+            with engine.connect() as conn:
+                outer = conn.begin()
+                db = Session(bind=conn, join_transaction_mode="create_savepoint")
+                recorder.active = i == 0
+                started = time.perf_counter()
+                fn(db)
+                latencies.append((time.perf_counter() - started) * 1000)
+                recorder.active = False
+                db.close()
+                outer.rollback()
+
+        entry = {"latency_ms": summarize(latencies)}
+        if check_plans:
+            function = name.split("[")[0]
+            entry["queries"] = explain(engine, recorder.statements, ALLOWED_SCANS.get(function, set()))
+            failed |= any(query["problems"] for query in entry["queries"])
+        report[name] = entry
+
+    result = {
+        "commit": git_commit(),
+        "database_url": args.database_url,
+        "movies": movie_count,
+        "reviews": review_count,
+        "repeat": args.repeat,
+        "plan_checked": check_plans,
+        "plan_ok": not failed,
+        "results": report,
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+    if failed:
+        print("❌ 전체 스캔 / 임시 정렬 쿼리가 있습니다.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
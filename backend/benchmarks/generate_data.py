@@ -0,0 +1,142 @@
+"""
+대용량 합성 데이터 적재 (crud 성능 / 쿼리 플랜 확인용)
+
+    cd backend
+    python -m benchmarks.generate_data --movies 10000 --reviews 5000000 \\
+        --database-url sqlite:////tmp/movies_scale.db --reset
+
+- 감성분석 없이 라벨 / 별점을 무작위로 채워 bulk insert (청크 단위 트랜잭션)
+- 영화별 리뷰 수는 인기순으로 치우치게 (Zipf 분포) → 리뷰가 아주 많은 영화도 생김
+- 적재 후 crud.recompute_movie_stats로 영화 집계를 맞춤
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+SAMPLE_PATH = Path(__file__).parent / "data" / "labeled_reviews.jsonl"
+DEFAULT_DATABASE_URL = "sqlite:////tmp/movies_scale.db"
+
+GENRES = ["드라마", "액션", "코미디", "스릴러", "로맨스", "SF", "애니메이션", "공포"]
+
+# 라벨별 별점 범위 (calculate_sentiment_score와 같은 구간)
+SCORE_RANGES = {"긍정": (3.0, 5.0), "중립": (2.5, 3.0), "부정": (1.5, 2.5)}
+
+
+def _sample_texts() -> list:
+    with open(SAMPLE_PATH, encoding="utf-8") as f:
+        return [json.loads(line)["text"] for line in f if line.strip()]
+
+
+def movie_rows(count: int, rng, start: datetime) -> list:
+    return [
+        {
+            "title": f"합성 영화 {i}",
+            "release_date": (start + timedelta(days=int(day))).date().isoformat(),
+            "director": f"감독 {i % 997}",
+            "genre": GENRES[i % len(GENRES)],
+            "poster_url": "",
+            "created_at": start + timedelta(seconds=int(day) * 86400 + i),
+        }
+        for i, day in enumerate(rng.integers(0, 3650, size=count))
+    ]
+
+
+def review_chunks(movie_ids, count: int, chunk_size: int, rng, start: datetime, zipf: float):
+    """리뷰 row dict 목록을 chunk_size개씩 생성"""
+    texts = _sample_texts()
+    labels = list(SCORE_RANGES)
+
+    # 인기 순위가 높은 영화일수록 리뷰가 많음 (순위^-zipf 비율)
+    weights = 1.0 / np.arange(1, len(movie_ids) + 1) ** zipf
+    weights /= weights.sum()
+    popularity = rng.permutation(np.asarray(movie_ids))
+
+    span_seconds = 365 * 86400
+    for offset in range(0, count, chunk_size):
+        size = min(chunk_size, count - offset)
+        movies = popularity[rng.choice(len(movie_ids), size=size, p=weights)].tolist()
+        label_ids = rng.choice(len(labels), size=size, p=[0.5, 0.2, 0.3]).tolist()
+        fractions = rng.random(size).tolist()
+        seconds = rng.integers(0, span_seconds, size=size).tolist()
+        text_ids = rng.integers(0, len(texts), size=size).tolist()
+
+        rows = []
+        for i in range(size):
+            label = labels[label_ids[i]]
+            low, high = SCORE_RANGES[label]
+            rows.append({
+                "movie_id": movies[i],
+                "author": f"user{(offset + i) % 100_000}",
+                "content": texts[text_ids[i]],
+                "sentiment_label": label,
+                "sentiment_confidence": round(0.5 + fractions[i] / 2, 3),
+                "sentiment_score": round(low + (high - low) * fractions[i], 2),
+                "created_at": start + timedelta(seconds=seconds[i], microseconds=i % 1_000_000),
+            })
+        yield rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--movies", type=int, default=10_000)
+    parser.add_argument("--reviews", type=int, default=5_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--zipf", type=float, default=0.8, help="영화 인기 편중 정도 (0이면 균등)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reset", action="store_true", help="기존 테이블을 지우고 새로 생성")
+    args = parser.parse_args()
+
+    # database 모듈이 import 시점에 엔진을 만들므로 먼저 지정
+    os.environ["DATABASE_URL"] = args.database_url
+    from sqlalchemy import func, insert, select
+
+    import crud
+    import versions
+    from database import Base, SessionLocal, engine
+    from models import Movie, Review
+
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(Movie)).scalar():
+            raise SystemExit("이미 데이터가 있습니다. --reset으로 새로 만드세요.")
+
+    rng = np.random.default_rng(args.seed)
+    start = datetime(2024, 1, 1)
+    started = time.perf_counter()
+
+    with engine.begin() as conn:
+        conn.execute(insert(Movie), movie_rows(args.movies, rng, start))
+        # 실행 중인 API가 있으면 ETag가 바뀌도록 공유 카운터도 같은 트랜잭션에서 올림
+        versions.bump_shared(conn)
+        movie_ids = conn.execute(select(Movie.id)).scalars().all()
+
+    inserted = 0
+    for rows in review_chunks(movie_ids, args.reviews, args.chunk_size, rng, start, args.zipf):
+        with engine.begin() as conn:
+            conn.execute(insert(Review), rows)
+            versions.bump_shared(conn)
+        inserted += len(rows)
+        print(f"리뷰 {inserted:,}/{args.reviews:,} ({time.perf_counter() - started:.0f}s)", flush=True)
+
+    with SessionLocal() as db:
+        crud.recompute_movie_stats(db)
+
+    print(json.dumps({
+        "database_url": args.database_url,
+        "movies": len(movie_ids),
+        "reviews": inserted,
+        "elapsed_s": round(time.perf_counter() - started, 1),
+    }, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
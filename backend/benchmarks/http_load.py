@@ -0,0 +1,281 @@
+"""
+HTTP 부하 테스트 / 엔드포인트별 지연 시간 벤치마크
+
+    cd backend
+    python -m benchmarks.http_load --concurrency 16 --duration 30
+    python -m benchmarks.http_load --url http://127.0.0.1:8000   # 이미 떠 있는 서버 대상
+
+- 기본: 임시 SQLite DB + 스텁 모델(SENTIMENT_STUB=1)로 uvicorn을 띄워 측정 후 종료
+- 혼합 워크로드 (기본 GET /movies 45%, GET /movies/{id}/reviews 45%, POST /reviews 10%)
+- 엔드포인트별 처리량, p50/p95/p99(ms)를 JSON으로 출력 → 커밋끼리 비교
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from benchmarks.common import BACKEND_DIR, git_commit, summarize
+
+SAMPLE_PATH = Path(__file__).parent / "data" / "labeled_reviews.jsonl"
+
+# 워크로드 이름 → 엔드포인트 (리포트 키)
+ENDPOINTS = {
+    "movies": "GET /movies",
+    "catalog": "GET /catalog",
+    "movie_reviews": "GET /movies/{id}/reviews",
+    "post_review": "POST /reviews",
+}
+DEFAULT_MIX = "movies=45,movie_reviews=45,post_review=10"
+
+
+class Client:
+    """스레드 하나가 쓰는 keep-alive 연결 (끊기면 다시 연결)"""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.conn = None
+
+    def request(self, method: str, path: str, body=None):
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        try:
+            self.conn.request(method, path, body=payload, headers=headers)
+            response = self.conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = None
+            raise
+        return response.status, data
+
+
+# =========================
+# 서버 실행 / 데이터 준비
+# =========================
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workdir: Path, port: int, extra_env: dict) -> subprocess.Popen:
+    """임시 SQLite DB + 스텁 모델로 uvicorn 실행 (로그는 workdir/server.log)"""
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite:///{workdir / 'bench.db'}",
+        "SENTIMENT_STUB": "1",
+        "SENTIMENT_CACHE_DB": "",
+    })
+    env.update(extra_env)
+    log = open(workdir / "server.log", "wb")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+
+
+def wait_ready(client: Client, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            status, _ = client.request("GET", "/readyz")
+            if status == 200:
+                return
+        except (OSError, http.client.HTTPException):
+            pass
+        time.sleep(0.2)
+    raise SystemExit("서버가 준비되지 않았습니다 (readyz 타임아웃).")
+
+
+def _sample_texts() -> list:
+    with open(SAMPLE_PATH, encoding="utf-8") as f:
+        return [json.loads(line)["text"] for line in f if line.strip()]
+
+
+def seed(client: Client, movies: int, reviews_per_movie: int) -> list:
+    """영화 movies개 + 영화마다 리뷰 reviews_per_movie개 등록 → 영화 id 목록"""
+    texts = _sample_texts()
+    movie_ids = []
+    for i in range(movies):
+        status, data = client.request("POST", "/movies", {
+            "title": f"벤치마크 영화 {i}", "director": f"감독 {i % 7}", "genre": "드라마",
+        })
+        if status != 200:
+            raise SystemExit(f"영화 등록 실패: {status} {data[:200]!r}")
+        movie_id = json.loads(data)["id"]
+        movie_ids.append(movie_id)
+
+        if reviews_per_movie:
+            rows = [
+                {"movie_id": movie_id, "author": f"user{j}", "content": f"{texts[j % len(texts)]} #{i}-{j}"}
+                for j in range(reviews_per_movie)
+            ]
+            status, data = client.request("POST", "/reviews/bulk", rows)
+            if status != 200:
+                raise SystemExit(f"리뷰 등록 실패: {status} {data[:200]!r}")
+    return movie_ids
+
+
+# =========================
+# 부하 생성
+# =========================
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise SystemExit(f"알 수 없는 워크로드: {name} ({', '.join(ENDPOINTS)})")
+        weights[name] = float(weight)
+    return weights
+
+
+def run_worker(worker_id, client, movie_ids, weights, texts, start_at, stop_at, samples):
+    rng = random.Random(worker_id)
+    names, cum_weights = list(weights), []
+    total = 0.0
+    for name in names:
+        total += weights[name]
+        cum_weights.append(total)
+
+    while True:
+        now = time.monotonic()
+        if now >= stop_at:
+            break
+        name = rng.choices(names, cum_weights=cum_weights)[0]
+        movie_id = rng.choice(movie_ids)
+
+        if name == "movies":
+            method, path, body = "GET", "/movies", None
+        elif name == "catalog":
+            method, path, body = "GET", "/catalog?limit=12", None
+        elif name == "movie_reviews":
+            method, path, body = "GET", f"/movies/{movie_id}/reviews?limit=10", None
+        else:
+            # 매번 다른 본문이라 감성분석 캐시에 걸리지 않음
+            text = f"{rng.choice(texts)} ({worker_id}-{rng.random():.6f})"
+            method, path, body = "POST", "/reviews", {"movie_id": movie_id, "author": "bench", "content": text}
+
+        started = time.perf_counter()
+        try:
+            status, _ = client.request(method, path, body)
+        except (OSError, http.client.HTTPException):
+            status = 0
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if now >= start_at:  # 워밍업 구간은 제외
+            samples.append((name, status, elapsed_ms))
+
+
+def run_load(host, port, movie_ids, weights, concurrency, duration, warmup, timeout) -> list:
+    texts = _sample_texts()
+    start_at = time.monotonic() + warmup
+    stop_at = start_at + duration
+    samples = []  # list.append는 스레드 안전
+    threads = [
+        threading.Thread(
+            target=run_worker,
+            args=(i, Client(host, port, timeout), movie_ids, weights, texts, start_at, stop_at, samples),
+        )
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def report(samples, duration: float) -> dict:
+    by_endpoint = {}
+    for name, status, elapsed_ms in samples:
+        by_endpoint.setdefault(ENDPOINTS[name], []).append((status, elapsed_ms))
+
+    def stats(rows):
+        ok = [ms for status, ms in rows if 200 <= status < 300]
+        return {
+            "requests": len(rows),
+            "errors": len(rows) - len(ok),
+            "rps": round(len(rows) / duration, 1),
+            "latency_ms": summarize(ok),
+        }
+
+    return {
+        "total": stats([row for rows in by_endpoint.values() for row in rows]),
+        "endpoints": {name: stats(rows) for name, rows in sorted(by_endpoint.items())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="측정할 서버 주소 (없으면 임시 서버를 띄움)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=3, help="측정에서 제외할 시작 구간(초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"워크로드 비율 (기본 {DEFAULT_MIX})")
+    parser.add_argument("--movies", type=int, default=50)
+    parser.add_argument("--reviews-per-movie", type=int, default=20)
+    parser.add_argument("--stub-latency-ms", type=float, default=5, help="스텁 모델의 배치당 추론 시간")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--output", help="리포트를 저장할 JSON 파일 (기본: 표준 출력)")
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    server = None
+    with tempfile.TemporaryDirectory(prefix="movie-bench-") as workdir:
+        if args.url:
+            parsed = urlparse(args.url)
+            host, port = parsed.hostname, parsed.port or 80
+        else:
+            host, port = "127.0.0.1", _free_port()
+            server = start_server(
+                Path(workdir), port, {"SENTIMENT_STUB_LATENCY_MS": str(args.stub_latency_ms)}
+            )
+        try:
+            client = Client(host, port, args.timeout)
+            wait_ready(client, timeout=60)
+            movie_ids = seed(client, args.movies, args.reviews_per_movie)
+            samples = run_load(
+                host, port, movie_ids, weights,
+                args.concurrency, args.duration, args.warmup, args.timeout,
+            )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+
+    result = {
+        "commit": git_commit(),
+        "config": {
+            "url": args.url or "local (stub model, temp SQLite)",
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "mix": weights,
+            "movies": args.movies,
+            "reviews_per_movie": args.reviews_per_movie,
+            "stub_latency_ms": None if args.url else args.stub_latency_ms,
+        },
+        **report(samples, args.duration),
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
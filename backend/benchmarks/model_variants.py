@@ -0,0 +1,130 @@
+"""
+모델 변형(fp32 / optimized / int8) 정확도 · 지연 시간 비교 리포트
+
+    cd backend
+    python -m benchmarks.model_variants [--fresh] [--repeat 5] [--variants fp32,int8]
+
+- 라벨 샘플(jsonl)로 정확도와 fp32 대비 라벨 일치율 / 별점 차이를 계산
+- 세션 로드 시간 (첫 로드 / 저장된 그래프 재사용), 리뷰 1건 지연 시간 p50/p95, 배치 처리량 측정
+"""
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+import sentiment
+from benchmarks.common import git_commit, percentile
+
+DEFAULT_SAMPLE_PATH = Path(__file__).parent / "data" / "labeled_reviews.jsonl"
+
+
+def load_samples(path):
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [row["text"] for row in rows], [row["label"] for row in rows]
+
+
+def _clear_saved_models():
+    """저장된 양자화 / 최적화 모델 삭제 (원본 model.onnx는 유지)"""
+    for path in sentiment.CACHE_DIR.glob("model.*.onnx"):
+        path.unlink()
+
+
+def measure(variant: str, texts, labels, repeat: int) -> dict:
+    started = time.perf_counter()
+    sentiment.create_session(variant)
+    first_load = time.perf_counter() - started
+
+    # 두 번째 로드: optimized / int8은 저장된 그래프를 그대로 사용
+    started = time.perf_counter()
+    session = sentiment.create_session(variant)
+    cached_load = time.perf_counter() - started
+
+    sentiment._score_batch(texts[:1], session)  # 워밍업
+    predictions = sentiment._score_batch(texts, session)
+
+    latencies = []
+    for _ in range(repeat):
+        for text in texts:
+            started = time.perf_counter()
+            sentiment._score_batch([text], session)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        sentiment._score_batch(texts, session)
+    batch_seconds = time.perf_counter() - started
+
+    # 두 번째 로드가 실제로 읽은 파일 (optimized / int8은 저장된 최적화 그래프)
+    model_path = sentiment.session_model_path(variant)
+    correct = sum(label == gold for (label, _, _), gold in zip(predictions, labels))
+    return {
+        "variant": variant,
+        "model_file": model_path.name,
+        "model_mb": round(model_path.stat().st_size / 2**20, 1),
+        "first_load_s": round(first_load, 3),
+        "cached_load_s": round(cached_load, 3),
+        "accuracy": round(correct / len(labels), 4),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p95": round(percentile(latencies, 0.95), 2),
+            "mean": round(statistics.fmean(latencies), 2),
+        },
+        "batch_reviews_per_s": round(len(texts) * repeat / batch_seconds, 1),
+        "predictions": predictions,
+    }
+
+
+def compare(results: list) -> None:
+    """fp32 대비 라벨 일치율 / 평균 별점 차이"""
+    predictions = {result["variant"]: result.pop("predictions") for result in results}
+    reference = predictions.get("fp32")
+    if reference is None:
+        return
+    for result in results:
+        pairs = list(zip(predictions[result["variant"]], reference))
+        result["agreement_with_fp32"] = round(
+            sum(a[0] == b[0] for a, b in pairs) / len(pairs), 4
+        )
+        result["mean_score_diff_vs_fp32"] = round(
+            statistics.fmean(abs(a[2] - b[2]) for a, b in pairs), 4
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", default=str(DEFAULT_SAMPLE_PATH))
+    parser.add_argument("--variants", default=",".join(sentiment.MODEL_VARIANTS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fresh", action="store_true", help="저장된 최적화/양자화 모델을 지우고 측정")
+    parser.add_argument("--output", help="리포트를 저장할 JSON 파일 (기본: 표준 출력)")
+    args = parser.parse_args()
+
+    texts, labels = load_samples(args.samples)
+    variants = [v for v in args.variants.split(",") if v]
+
+    session, _ = sentiment.load_model()  # 원본 모델 다운로드 + 토크나이저
+    if session is None:
+        raise SystemExit("모델을 로드하지 못했습니다.")
+    if args.fresh:
+        _clear_saved_models()
+
+    results = [measure(variant, texts, labels, args.repeat) for variant in variants]
+    compare(results)
+
+    report = {
+        "commit": git_commit(),
+        "samples": len(texts),
+        "repeat": args.repeat,
+        "intra_op_threads": sentiment.ORT_INTRA_OP_THREADS,
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+배치 후처리(postprocess_batch)가 리뷰별 스칼라 계산과 같은 결과를 내는지 확인 + 속도 비교
+
+    cd backend
+    python -m benchmarks.postprocess_check [--rows 100000] [--seed 0]
+
+- 무작위 logits / 키워드 개수에 동점, 임계값 근처 값을 섞어 비교 (다르면 exit 1)
+- 모델 없이 실행됨
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+import sentiment
+
+CATEGORIES = ("contrast", "positive", "strong_negative", "negative", "conditional")
+
+
+def random_inputs(rows: int, seed: int):
+    rng = np.random.default_rng(seed)
+    logits = (rng.standard_normal((rows, 3)) * 3).astype(np.float32)
+
+    # 동점 / 같은 logits / 거의 같은 확률 행
+    logits[::97] = logits[::97, :1]
+    logits[1::89, 2] = logits[1::89, 0]
+    logits[2::83] = rng.standard_normal((len(logits[2::83]), 3)).astype(np.float32) * 0.05
+
+    counts = [
+        dict(zip(CATEGORIES, values))
+        for values in rng.integers(0, 3, size=(rows, len(CATEGORIES))).tolist()
+    ]
+    return logits, counts
+
+
+def scalar_results(logits: np.ndarray, batch_counts):
+    results = []
+    for row, counts in zip(logits, batch_counts):
+        exp_logits = np.exp(row - np.max(row))
+        probs = exp_logits / exp_logits.sum()
+        neg, neu, pos = probs.tolist()
+        neg, neu, pos = sentiment.adjust_mixed_sentiment("", neg, neu, pos, counts)
+        label, confidence, score = sentiment.calculate_sentiment_score(neg, neu, pos)
+        results.append((label, round(confidence, 3), round(score, 2)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logits, counts = random_inputs(args.rows, args.seed)
+
+    started = time.perf_counter()
+    expected = scalar_results(logits, counts)
+    scalar_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual, _ = sentiment.postprocess_batch(logits, counts)
+    batch_s = time.perf_counter() - started
+
+    mismatches = [i for i, (a, b) in enumerate(zip(expected, actual)) if a != b]
+    for i in mismatches[:10]:
+        print(f"❌ {i}: logits={logits[i].tolist()} counts={counts[i]} 스칼라={expected[i]} 배치={actual[i]}")
+
+    print(json.dumps({
+        "rows": args.rows,
+        "mismatches": len(mismatches),
+        "scalar_s": round(scalar_s, 3),
+        "batch_s": round(batch_s, 3),
+        "speedup": round(scalar_s / batch_s, 1),
+    }, ensure_ascii=False))
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+토크나이저 골든셋 비교 (fast 토크나이저가 기존 BertTokenizer와 같은 토큰을 내는지 확인)
+
+SENTIMENT_FAST_TOKENIZER=1(fast 토크나이저 사용)로 바꾸기 전에 실제 모델 vocab으로 통과해야 함
+
+    cd backend
+    python -m benchmarks.tokenizer_golden --write   # BertTokenizer(slow)로 골든셋 생성
+    python -m benchmarks.tokenizer_golden           # fast 토크나이저 결과를 골든셋과 비교 (다르면 exit 1)
+
+- 비교는 추론 경로와 같은 입력(normalize_text)을 sentiment._encode로 인코딩해 리뷰별 토큰 수만큼 잘라서 수행
+- 골든셋 첫 줄에 vocab.txt 해시를 기록 → 다른 vocab으로 만든 골든셋과는 비교하지 않음
+"""
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import sentiment
+from benchmarks.model_variants import DEFAULT_SAMPLE_PATH, load_samples
+from sentiment_cache import normalize_text
+
+DEFAULT_GOLDEN_PATH = Path(__file__).parent / "data" / "tokenizer_golden.jsonl"
+
+# 라벨 샘플 외에 토크나이저 차이가 나기 쉬운 입력
+EDGE_CASES = [
+    "",
+    "   앞뒤 공백   ",
+    "ㅋㅋㅋㅋㅋ ㅠㅠ 진짜 최고!!!",
+    "이 영화 10점 만점에 9.5점 👍👍",
+    "Marvel 영화 중 BEST... 강추 :)",
+    "한자 愛情 과 일본어 かわいい 섞인 리뷰",
+    "악센트 café naïve résumé",
+    "조합형 한글 \u1100\u1161\u11a8 과 완성형 \uac01",
+    "탭\t줄바꿈\n섞인\r\n리뷰",
+    "엄청 긴 리뷰 " * 80,
+]
+
+
+def golden_texts(samples_path) -> list:
+    texts, _ = load_samples(samples_path)
+    return texts + EDGE_CASES
+
+
+def vocab_digest() -> str:
+    return hashlib.sha256((sentiment.CACHE_DIR / "vocab.txt").read_bytes()).hexdigest()
+
+
+def encode_rows(tokenizer, texts) -> list:
+    """
+    리뷰별 (input_ids, token_type_ids) 목록
+    - 추론 경로는 항상 normalize_text(NFC + 공백 정리)를 거친 텍스트를 넘기므로 여기서도 같게 맞춤
+      (slow BertTokenizer는 내부에서 NFC 정규화하지만 fast는 하지 않아, 조합형 한글 원문은 서로 다르게 나뉨)
+    """
+    encoded = sentiment._encode(tokenizer, [normalize_text(text[:256]) for text in texts])
+    rows = []
+    for i, length in enumerate(encoded["lengths"].tolist()):
+        rows.append({
+            "input_ids": encoded["input_ids"][i, :length].tolist(),
+            "token_type_ids": encoded["token_type_ids"][i, :length].tolist(),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", default=str(DEFAULT_SAMPLE_PATH))
+    parser.add_argument("--golden", default=str(DEFAULT_GOLDEN_PATH))
+    parser.add_argument("--write", action="store_true", help="BertTokenizer(slow)로 골든셋을 새로 생성")
+    args = parser.parse_args()
+
+    _, tokenizer = sentiment.load_model()  # vocab 다운로드
+    if tokenizer is None:
+        raise SystemExit("토크나이저를 로드하지 못했습니다.")
+    # 비교 대상은 항상 fast 토크나이저 (SENTIMENT_FAST_TOKENIZER 설정과 무관)
+    fast = sentiment.BertTokenizerFast.from_pretrained(sentiment.CACHE_DIR)
+
+    if args.write:
+        slow = sentiment.BertTokenizer.from_pretrained(sentiment.CACHE_DIR)
+        if slow.is_fast:
+            # transformers 5.x의 BertTokenizer는 fast와 같은 클래스 → 자기 자신과 비교하는 골든셋이 됨
+            raise SystemExit('파이썬 BertTokenizer가 필요합니다: requirements.txt대로 "transformers<5"를 설치하세요.')
+        texts = golden_texts(args.samples)
+        with open(args.golden, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"vocab_sha256": vocab_digest(), "tokenizer": type(slow).__name__}) + "\n")
+            for text, row in zip(texts, encode_rows(slow, texts)):
+                f.write(json.dumps({"text": text, **row}, ensure_ascii=False) + "\n")
+        print(f"골든셋 {len(texts)}건 저장: {args.golden}")
+        return
+
+    if not Path(args.golden).exists():
+        raise SystemExit(f"골든셋이 없습니다: {args.golden} (--write로 먼저 생성)")
+    with open(args.golden, encoding="utf-8") as f:
+        header, *golden = [json.loads(line) for line in f if line.strip()]
+    if header.get("vocab_sha256") != vocab_digest():
+        raise SystemExit("골든셋을 만든 vocab.txt와 현재 모델의 vocab.txt가 다릅니다. --write로 다시 생성하세요.")
+
+    rows = encode_rows(fast, [row["text"] for row in golden])
+    mismatches = [
+        (expected, actual) for expected, actual in zip(golden, rows)
+        if expected["input_ids"] != actual["input_ids"]
+        or expected["token_type_ids"] != actual["token_type_ids"]
+    ]
+    for expected, actual in mismatches:
+        print(f"❌ {expected['text'][:40]!r}\n   기대: {expected['input_ids']}\n   실제: {actual['input_ids']}")
+
+    print(f"{type(fast).__name__}: {len(golden) - len(mismatches)}/{len(golden)}건 일치")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
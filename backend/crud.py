@@ -1,15 +1,27 @@
+import base64
+import json
+from collections import defaultdict
+from sqlalchemy import func, insert, select, tuple_, update
 from sqlalchemy.orm import Session
-from models import Movie, Review
-from sentiment import analyze_sentiment
+from typing import Dict, Iterable, List, Optional, Tuple
+import metrics
+import versions
+from models import Movie, Review, avg_score_key
+from sentiment import analyze_sentiment, analyze_sentiment_batch
 from datetime import datetime
 from schemas import MovieCreate, ReviewCreate
 
 
+# 대량 등록 시 한 트랜잭션에 넣는 리뷰 수
+BULK_CHUNK_SIZE = 500
+
+
 # ---------- Movie ----------
 def create_movie(db: Session, data: MovieCreate):
     movie = Movie(**data.model_dump())
     db.add(movie)
     db.commit()
+    versions.bump_catalog()
     db.refresh(movie)
     return movie
 
@@ -22,16 +34,218 @@ def get_movie(db: Session, movie_id: int):
     return db.query(Movie).filter(Movie.id == movie_id).first()
 
 
+# ---------- Catalog ----------
+# 정렬 이름 → (정렬 키, 내림차순 여부), 키가 같으면 id로 순서 고정
+CATALOG_SORTS = {
+    "recent": (None, True),
+    "score": (avg_score_key, True),
+    "reviews": (Movie.review_count, True),
+    "title": (Movie.title, False),
+}
+
+# 커서에 담긴 정렬 키 값의 허용 타입 (id는 항상 int)
+# SQLite는 타입이 달라도 그냥 비교하지만 Postgres는 DataError(500)가 나므로 디코딩할 때 걸러 냄
+CATALOG_KEY_TYPES = {
+    "score": (int, float),
+    "reviews": (int,),
+    "title": (str,),
+}
+
+CATALOG_COLUMNS = (
+    Movie.id,
+    Movie.title,
+    Movie.release_date,
+    Movie.director,
+    Movie.genre,
+    Movie.poster_url,
+    Movie.review_count,
+    Movie.score_sum,
+)
+
+
+def _catalog_position(sort: str, cursor: str) -> list:
+    """카탈로그 커서 → [정렬 키, id] 또는 [id], 정렬이나 값 타입이 맞지 않으면 ValueError"""
+    cursor_sort, *position = _decode_json_cursor(cursor)
+    expected = [(int,)] if CATALOG_SORTS[sort][0] is None else [CATALOG_KEY_TYPES[sort], (int,)]
+    if cursor_sort != sort or len(position) != len(expected):
+        raise ValueError("잘못된 커서입니다.")
+    for value, types in zip(position, expected):
+        # bool은 int의 하위 클래스라 따로 거름
+        if isinstance(value, bool) or not isinstance(value, types):
+            raise ValueError("잘못된 커서입니다.")
+    return position
+
+
+def get_catalog(db: Session, sort: str = "recent", limit: int = 30, after: Optional[str] = None):
+    """
+    영화 목록 화면용 카드 정보 + 평균 별점 / 리뷰 수 (쿼리 한 번)
+    - 정렬 키 + id 키셋 페이지네이션 (정렬별 인덱스를 따라 읽음)
+    - 전체 영화 수는 같은 SELECT의 스칼라 서브쿼리로 함께 조회
+    """
+    key, descending = CATALOG_SORTS[sort]
+    keys = [Movie.id] if key is None else [key, Movie.id]
+    total = select(func.count()).select_from(Movie).scalar_subquery()
+
+    stmt = select(*CATALOG_COLUMNS, keys[0].label("sort_key"), total.label("total"))
+    if after:
+        position = _catalog_position(sort, after)
+        if key is None:
+            stmt = stmt.where(Movie.id < position[0])
+        else:
+            bound, value = tuple_(key, Movie.id), tuple(position)
+            # 행 값 비교만으로는 식 인덱스 범위 검색을 못 하므로 정렬 키 범위를 따로 한 번 더 걸어 줌
+            if descending:
+                stmt = stmt.where(key <= position[0], bound < value)
+            else:
+                stmt = stmt.where(key >= position[0], bound > value)
+
+    stmt = stmt.order_by(*(k.desc() if descending else k.asc() for k in keys)).limit(limit + 1)
+    rows = db.execute(stmt).all()
+
+    if rows:
+        total_count = rows[0].total
+    else:
+        total_count = 0 if not after else db.scalar(select(func.count()).select_from(Movie))
+
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        position = [last.id] if key is None else [last.sort_key, last.id]
+        next_cursor = _encode_json_cursor([sort, *position])
+
+    return {
+        "items": [
+            {
+                "id": row.id,
+                "title": row.title,
+                "release_date": row.release_date,
+                "director": row.director,
+                "genre": row.genre,
+                "poster_url": row.poster_url,
+                "review_count": row.review_count,
+                "avg_score": round(row.score_sum / row.review_count, 2) if row.review_count else None,
+            }
+            for row in items
+        ],
+        "total": total_count,
+        "next_cursor": next_cursor,
+    }
+
+
 def delete_movie(db: Session, movie_id: int):
     movie = db.query(Movie).filter(Movie.id == movie_id).first()
     if movie:
+        # 리뷰를 ORM 객체로 전부 읽어 한 건씩 지우지 않고 DELETE 한 번으로 삭제
+        db.query(Review).filter(Review.movie_id == movie_id).delete(synchronize_session=False)
         db.delete(movie)
         db.commit()
+        versions.bump_movies([movie_id])
+
+
+# ---------- Movie stats ----------
+# 비동기 채점 모드에서 감성분석 대기 중인 리뷰의 라벨
+PENDING_LABEL = "pending"
+
+LABEL_COUNT_COLUMNS = {
+    "긍정": "positive_count",
+    "중립": "neutral_count",
+    "부정": "negative_count",
+}
+
+
+def _apply_movie_stats(db: Session, scored: Iterable[Tuple[int, str, Optional[float]]], sign: int = 1):
+    """
+    (movie_id, label, score) 목록만큼 영화 집계를 증감 (commit은 호출자 트랜잭션에서)
+    - pending 리뷰는 평점 집계 대신 pending_count만 증감
+    """
+    deltas: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for movie_id, label, score in scored:
+        if label == PENDING_LABEL:
+            deltas[movie_id]["pending_count"] += sign
+            continue
+        if score is None:
+            continue
+        delta = deltas[movie_id]
+        delta["review_count"] += sign
+        delta["score_sum"] += sign * score
+        if label in LABEL_COUNT_COLUMNS:
+            delta[LABEL_COUNT_COLUMNS[label]] += sign
+
+    for movie_id, delta in deltas.items():
+        values = {
+            name: getattr(Movie, name) + (value if name == "score_sum" else int(value))
+            for name, value in delta.items()
+        }
+        db.execute(
+            update(Movie)
+            .where(Movie.id == movie_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def recompute_movie_stats(db: Session, movie_ids: Optional[List[int]] = None):
+    """
+    reviews 테이블에서 영화 집계를 다시 계산 (마이그레이션 / 대량 적재 후 보정용)
+    - 시드 CLI 등 다른 프로세스에서도 호출되므로 DB 공유 카운터도 같은 트랜잭션에서 올림
+    """
+    scored = (Review.movie_id == Movie.id) & (Review.sentiment_label != PENDING_LABEL)
+
+    def review_count(*conditions):
+        return (
+            select(func.count(Review.id))
+            .where(scored, *conditions)
+            .scalar_subquery()
+        )
+
+    values = {
+        "review_count": review_count(),
+        "score_sum": select(func.coalesce(func.sum(Review.sentiment_score), 0.0))
+        .where(scored)
+        .scalar_subquery(),
+    }
+    for label, name in LABEL_COUNT_COLUMNS.items():
+        values[name] = review_count(Review.sentiment_label == label)
+    values["pending_count"] = (
+        select(func.count(Review.id))
+        .where(Review.movie_id == Movie.id, Review.sentiment_label == PENDING_LABEL)
+        .scalar_subquery()
+    )
+
+    stmt = update(Movie).values(**values).execution_options(synchronize_session=False)
+    if movie_ids is not None:
+        stmt = stmt.where(Movie.id.in_(movie_ids))
+    db.execute(stmt)
+    versions.bump_shared(db)
+    db.commit()
+
+    if movie_ids is None:
+        versions.bump_all()
+    else:
+        versions.bump_movies(movie_ids)
 
 
 # ---------- Review ----------
-def create_review(db: Session, data: ReviewCreate):
-    label, confidence, score = analyze_sentiment(data.content)
+
+
+def create_review(
+    db: Session,
+    data: ReviewCreate,
+    defer: bool = False,
+    sentiment: Optional[Tuple[str, float, float]] = None,
+):
+    """
+    리뷰 저장
+    - defer=True면 감성분석 없이 PENDING_LABEL로 바로 저장 (scoring 워커가 채점)
+    - sentiment: 호출자가 미리 계산한 (label, confidence, score) (비동기 API 경로)
+    """
+    if defer:
+        label, confidence, score = PENDING_LABEL, None, None
+    elif sentiment is not None:
+        label, confidence, score = sentiment
+    else:
+        label, confidence, score = analyze_sentiment(data.content)
 
     review = Review(
         movie_id=data.movie_id,
@@ -44,27 +258,210 @@ def create_review(db: Session, data: ReviewCreate):
     )
 
     db.add(review)
-    db.commit()
-    db.refresh(review)
+    _apply_movie_stats(db, [(data.movie_id, label, score)])
+    with metrics.stage("db_commit"):
+        db.commit()
+    versions.bump_movies([data.movie_id])
+    with metrics.stage("db_refresh"):
+        db.refresh(review)
     return review
 
 
-def get_recent_reviews(db: Session, limit: int = 10):
-    return (
+def bulk_create_reviews(
+    db: Session,
+    items: List[Tuple[int, ReviewCreate]],
+    scores: Optional[List[Tuple[str, float, float]]] = None,
+):
+    """
+    (입력 순번, 리뷰) 목록을 배치 감성분석 후 한 번의 bulk insert / commit으로 저장
+    - scores: items와 같은 순서로 미리 계산한 감성분석 결과 (비동기 API 경로)
+    - 순번별 {"index", "id", "error"} 결과 반환
+    """
+    if not items:
+        return []
+
+    precomputed = dict(zip((index for index, _ in items), scores)) if scores is not None else None
+
+    movie_ids = {data.movie_id for _, data in items}
+    existing = {
+        movie_id
+        for (movie_id,) in db.query(Movie.id).filter(Movie.id.in_(movie_ids))
+    }
+
+    results = {}
+    valid = []
+    for index, data in items:
+        if data.movie_id in existing:
+            valid.append((index, data))
+        else:
+            results[index] = {"index": index, "id": None, "error": "영화를 찾을 수 없습니다."}
+
+    if valid:
+        if precomputed is not None:
+            scores = [precomputed[index] for index, _ in valid]
+        else:
+            scores = analyze_sentiment_batch([data.content for _, data in valid])
+        now = datetime.utcnow()
+        rows = [
+            {
+                "movie_id": data.movie_id,
+                "author": data.author,
+                "content": data.content,
+                "sentiment_label": label,
+                "sentiment_confidence": confidence,
+                "sentiment_score": score,
+                "created_at": now,
+            }
+            for (_, data), (label, confidence, score) in zip(valid, scores)
+        ]
+
+        try:
+            ids = db.scalars(
+                insert(Review).returning(Review.id, sort_by_parameter_order=True),
+                rows,
+            ).all()
+            _apply_movie_stats(
+                db,
+                [(row["movie_id"], row["sentiment_label"], row["sentiment_score"]) for row in rows],
+            )
+            with metrics.stage("db_commit"):
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            for index, _ in valid:
+                results[index] = {"index": index, "id": None, "error": f"저장 실패: {e}"}
+        else:
+            versions.bump_movies(row["movie_id"] for row in rows)
+            for (index, _), review_id in zip(valid, ids):
+                results[index] = {"index": index, "id": review_id, "error": None}
+
+    return [results[index] for index, _ in items]
+
+
+def get_review(db: Session, review_id: int):
+    return db.query(Review).filter(Review.id == review_id).first()
+
+
+def get_pending_review_ids(db: Session) -> List[int]:
+    return [
+        review_id
+        for (review_id,) in db.query(Review.id)
+        .filter(Review.sentiment_label == PENDING_LABEL)
+        .order_by(Review.id)
+    ]
+
+
+def score_pending_reviews(db: Session, review_ids: List[int]) -> List[int]:
+    """
+    대기 중인 리뷰들을 배치 감성분석해 결과를 저장하고 채점된 리뷰 id 반환
+    """
+    reviews = (
         db.query(Review)
-        .order_by(Review.created_at.desc())
-        .limit(limit)
+        .filter(Review.id.in_(review_ids), Review.sentiment_label == PENDING_LABEL)
         .all()
     )
+    if not reviews:
+        return []
 
+    # 추론은 쓰기 전에 (UPDATE를 먼저 하면 추론 / 모델 로드 내내 쓰기 락을 잡고 있게 됨)
+    scores = analyze_sentiment_batch([review.content for review in reviews])
 
-def get_reviews_by_movie(db: Session, movie_id: int):
-    return (
-        db.query(Review)
-        .filter(Review.movie_id == movie_id)
-        .order_by(Review.created_at.desc())
+    # 대기 → 채점 완료: pending_count를 빼고 평점 집계에 더함 (commit 직전에 함께)
+    _apply_movie_stats(db, [(review.movie_id, PENDING_LABEL, None) for review in reviews], sign=-1)
+    for review, (label, confidence, score) in zip(reviews, scores):
+        review.sentiment_label = label
+        review.sentiment_confidence = confidence
+        review.sentiment_score = score
+    _apply_movie_stats(
+        db, [(review.movie_id, review.sentiment_label, review.sentiment_score) for review in reviews]
+    )
+    # commit 후에는 속성이 만료되어 다시 조회하므로 미리 꺼내 둠
+    movie_ids = [review.movie_id for review in reviews]
+    scored_ids = [review.id for review in reviews]
+    db.commit()
+    versions.bump_movies(movie_ids)
+    return scored_ids
+
+
+# ---------- Review pagination (keyset) ----------
+def _encode_json_cursor(values: list) -> str:
+    raw = json.dumps(values, ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_json_cursor(cursor: str) -> list:
+    """커서 문자열 → 값 목록, 형식이 잘못되면 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception as e:
+        raise ValueError("잘못된 커서입니다.") from e
+    if not isinstance(values, list):
+        raise ValueError("잘못된 커서입니다.")
+    return values
+
+
+def encode_cursor(review: Review) -> str:
+    """마지막 리뷰의 (created_at, id)를 불투명한 커서 문자열로 인코딩"""
+    return _encode_json_cursor([review.created_at.isoformat(), review.id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """커서 → (created_at, id), 형식이 잘못되면 ValueError"""
+    try:
+        created_at, review_id = _decode_json_cursor(cursor)
+        return datetime.fromisoformat(created_at), int(review_id)
+    except Exception as e:
+        raise ValueError("잘못된 커서입니다.") from e
+
+
+def _paginate_reviews(query, limit: int, after: Optional[str]):
+    """
+    (created_at, id) 내림차순 키셋 페이지네이션
+    - 복합 인덱스 (…, created_at, id)를 따라 읽으므로 페이지 위치와 무관하게 일정한 비용
+    """
+    if after:
+        created_at, review_id = decode_cursor(after)
+        query = query.filter(tuple_(Review.created_at, Review.id) < (created_at, review_id))
+
+    rows = (
+        query.order_by(Review.created_at.desc(), Review.id.desc())
+        .limit(limit + 1)
         .all()
     )
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1]) if len(rows) > limit else None
+    return items, next_cursor
+
+
+def get_recent_reviews(db: Session, limit: int = 10, after: Optional[str] = None):
+    items, next_cursor = _paginate_reviews(db.query(Review), limit, after)
+    return {"items": items, "total": None, "next_cursor": next_cursor}
+
+
+def get_reviews_by_movie(db: Session, movie_id: int, limit: int = 10, after: Optional[str] = None):
+    """
+    영화별 리뷰 한 페이지 + 전체 리뷰 수 + 영화 평균 별점 (집계 컬럼)
+    - 전체 리뷰 수는 리뷰를 세지 않고 집계 컬럼(채점 완료 + 대기 중)에서 계산
+    - 영화가 없으면 None
+    """
+    stats = db.execute(
+        select(Movie.review_count, Movie.pending_count, Movie.score_sum).where(Movie.id == movie_id)
+    ).first()
+    if stats is None:
+        return None
+
+    items, next_cursor = _paginate_reviews(
+        db.query(Review).filter(Review.movie_id == movie_id), limit, after
+    )
+    review_count, pending_count, score_sum = stats
+    avg_score = round(score_sum / review_count, 2) if review_count else None
+    return {
+        "items": items,
+        "total": review_count + pending_count,
+        "next_cursor": next_cursor,
+        "avg_score": avg_score,
+    }
 
 
 def delete_review(db: Session, review_id: int):
@@ -72,6 +469,9 @@ def delete_review(db: Session, review_id: int):
     if not review:
         return None
 
+    movie_id = review.movie_id
     db.delete(review)
+    _apply_movie_stats(db, [(movie_id, review.sentiment_label, review.sentiment_score)], sign=-1)
     db.commit()
+    versions.bump_movies([movie_id])
     return {"message": "리뷰가 삭제되었습니다."}
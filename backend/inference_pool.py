@@ -0,0 +1,299 @@
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Set
+
+import logs
+
+logger = logging.getLogger(__name__)
+
+# 워커가 워밍업을 마쳤다고 알릴 때 쓰는 task_id
+READY = -1
+
+# 워커 생존 확인 주기 (초) - 결과 수신 여부와 무관하게 이 주기로 확인
+CHECK_INTERVAL = 0.5
+
+# 준비 전에 계속 죽는 워커(모델 로드 실패 등)의 재시작 대기 상한 (초, 1 → 3 → 7 ... 초로 증가)
+RESTART_BACKOFF_MAX = 60
+
+
+# =========================
+# 워커 프로세스
+# =========================
+def _worker_main(tasks, results, intra_op_threads: int, inter_op_threads: int):
+    """
+    워커 프로세스마다 자기 ONNX 세션을 들고 (task_id, texts) 배치를 채점
+    - 모델 로드에 실패하면 알리고 종료 (API 프로세스가 감지해 다시 띄움)
+    """
+    # sentiment import 전에 설정해야 세션 옵션에 반영됨
+    os.environ["INFERENCE_PROCESSES"] = "0"  # 워커 안에서 다시 풀을 만들지 않음
+    os.environ["INFERENCE_WORKERS"] = "1"
+    os.environ["ORT_INTRA_OP_THREADS"] = str(intra_op_threads)
+    os.environ["ORT_INTER_OP_THREADS"] = str(inter_op_threads)
+    os.environ["SENTIMENT_CACHE_DB"] = ""  # 결과 캐시는 API 프로세스에서만 사용
+
+    # spawn된 프로세스는 로그 설정을 물려받지 않으므로 따로 시작
+    logs.setup_logging()
+
+    import sentiment
+
+    # 모델 로드 + 길이 버킷별 워밍업 후 준비 완료 알림 (모델 로드 시간 포함)
+    ok = sentiment._warmup_session(sentiment.WARMUP_ROUNDS)
+    results.put((READY, ok, (os.getpid(), sentiment.model_load_seconds)))
+    if not ok:
+        # 실패한 채로 작업을 받으면 에러만 돌려주므로 종료 (종료 시 결과 큐는 flush됨)
+        sys.exit(1)
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        task_id, texts = task
+        try:
+            # (결과, 단계별 시간) → 메트릭은 API 프로세스에서 기록
+            results.put((task_id, True, sentiment._score_batch_timed(texts)))
+        except Exception as e:
+            results.put((task_id, False, f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """워커 프로세스 하나 + 전용 작업 큐 + 그 워커에 넘긴 작업 id"""
+
+    def __init__(self, proc, tasks):
+        self.proc = proc
+        self.tasks = tasks
+        self.inflight: Set[int] = set()
+        self.ready = False
+        self.failures = 0  # 준비 전에 연속으로 죽은 횟수 (재시작 대기 시간 계산)
+        self.restart_at = 0.0  # 죽은 뒤 이 시각(monotonic)이 지나야 다시 띄움
+
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.is_alive()
+
+
+# =========================
+# 멀티 프로세스 추론 풀
+# =========================
+class InferencePool:
+    """
+    API 프로세스는 텍스트 배치를 워커별 작업 큐에 넣고 Future로 결과를 받음
+    - 워커 프로세스 N개가 각자 ONNX 세션으로 추론 (코어 수에 맞춰 확장)
+    - 작업은 진행 중인 작업이 가장 적은 준비된 워커에 배정 (어느 워커가 어떤 작업을 가졌는지 추적)
+    - 워커 생존은 결과 수신과 별개로 주기적으로 확인 → 죽은 워커의 작업만 실패 처리하고 새 워커를 띄움
+    - 모델 로드에 실패한 워커는 스스로 종료, 재시작 간격을 늘려 가며 다시 띄움
+    - on_batch(timings, results): 배치마다 워커가 잰 단계별 시간과 결과
+    - on_ready(load_seconds): 워커가 모델 로드를 마쳤을 때
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        intra_op_threads: int,
+        inter_op_threads: int = 1,
+        on_batch: Optional[Callable] = None,
+        on_ready: Optional[Callable] = None,
+    ):
+        self.processes = processes
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.on_batch = on_batch
+        self.on_ready = on_ready
+
+        # fork는 부모의 스레드/ONNX 상태를 복사하므로 spawn 사용
+        self._ctx = mp.get_context("spawn")
+        self._results = self._ctx.Queue()
+
+        self._futures: Dict[int, Future] = {}
+        self._owners: Dict[int, _Worker] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._workers: List[_Worker] = []
+        self._all_ready = threading.Event()
+        # 모든 워커가 준비됐거나 하나라도 모델 로드에 실패했을 때 (wait_ready가 기다리는 대상)
+        self._settled = threading.Event()
+        self._collector = None
+        self._closed = False
+
+    def start(self):
+        with self._lock:
+            if self._workers:
+                return
+            self._workers = [self._spawn() for _ in range(self.processes)]
+            self._collector = threading.Thread(
+                target=self._collect, name="inference-pool-results", daemon=True
+            )
+            self._collector.start()
+        logs.event(
+            logger, logging.INFO, "추론 워커 프로세스 시작",
+            processes=self.processes,
+            intra_op_threads=self.intra_op_threads,
+            inter_op_threads=self.inter_op_threads,
+        )
+
+    def submit(self, texts: List[str]) -> Future:
+        self.start()
+        future: Future = Future()
+        with self._lock:
+            worker = self._pick_worker()
+            if worker is None:
+                future.set_exception(RuntimeError("사용 가능한 추론 워커가 없습니다."))
+                return future
+            task_id = next(self._ids)
+            self._futures[task_id] = future
+            self._owners[task_id] = worker
+            worker.inflight.add(task_id)
+            # 워커 교체(큐 교체)와 섞이지 않도록 락 안에서 넣음 (put은 feeder 스레드로 넘기므로 블로킹 없음)
+            worker.tasks.put((task_id, list(texts)))
+        return future
+
+    def is_ready(self) -> bool:
+        return self._all_ready.is_set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        모든 워커가 모델 로드 + 워밍업을 마칠 때까지 대기
+        - 워커가 모델 로드에 실패했거나 timeout이 지나면 False
+        """
+        self._settled.wait(timeout)
+        return self._all_ready.is_set()
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            if worker.alive():
+                worker.tasks.put(None)
+        for worker in workers:
+            if worker.proc is None:
+                continue
+            worker.proc.join(timeout=5)
+            if worker.proc.is_alive():
+                worker.proc.terminate()
+        self._fail_pending(RuntimeError("추론 풀이 종료되었습니다."))
+
+    def _spawn(self, worker: Optional[_Worker] = None) -> _Worker:
+        # 죽은 워커의 큐에는 꺼내지 않은 작업이 남아 있을 수 있으므로 큐도 새로 만듦
+        tasks = self._ctx.Queue()
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(tasks, self._results, self.intra_op_threads, self.inter_op_threads),
+            name="sentiment-inference-worker",
+            daemon=True,
+        )
+        proc.start()
+        if worker is None:
+            return _Worker(proc, tasks)
+        worker.proc, worker.tasks, worker.ready = proc, tasks, False
+        return worker
+
+    def _pick_worker(self) -> Optional[_Worker]:
+        """살아 있는 워커 중 준비된 워커 우선, 그중 진행 중인 작업이 가장 적은 워커 (락 안에서 호출)"""
+        alive = [worker for worker in self._workers if worker.alive()]
+        if not alive:
+            return None
+        ready = [worker for worker in alive if worker.ready] or alive
+        return min(ready, key=lambda worker: len(worker.inflight))
+
+    def _collect(self):
+        # 결과가 계속 들어와도 생존 확인이 밀리지 않도록 수신과 별개로 시간 기준으로 확인
+        next_check = time.monotonic() + CHECK_INTERVAL
+        while not self._closed:
+            try:
+                message = self._results.get(timeout=CHECK_INTERVAL)
+            except queue.Empty:
+                message = None
+            if message is not None:
+                self._handle(*message)
+            if time.monotonic() >= next_check:
+                self._check_workers()
+                next_check = time.monotonic() + CHECK_INTERVAL
+
+    def _handle(self, task_id: int, ok: bool, payload):
+        if task_id == READY:
+            self._mark_ready(*payload, ok)
+            return
+
+        with self._lock:
+            future = self._futures.pop(task_id, None)
+            worker = self._owners.pop(task_id, None)
+            if worker is not None:
+                worker.inflight.discard(task_id)
+        if future is None:
+            # 워커 종료로 이미 실패 처리된 작업
+            return
+        if not ok:
+            future.set_exception(RuntimeError(payload))
+            return
+
+        results, timings = payload
+        if self.on_batch is not None and results:
+            self.on_batch(timings, results)
+        future.set_result(results)
+
+    def _mark_ready(self, pid: int, load_seconds: Optional[float], ok: bool):
+        if not ok:
+            # 워커는 스스로 종료 → _check_workers가 재시작
+            logs.event(logger, logging.ERROR, "추론 워커 모델 로드 실패", pid=pid)
+            self._settled.set()
+            return
+        if self.on_ready is not None and load_seconds is not None:
+            self.on_ready(load_seconds)
+        with self._lock:
+            for worker in self._workers:
+                if worker.proc is not None and worker.proc.pid == pid:
+                    worker.ready = True
+                    worker.failures = 0
+            if self._workers and all(worker.ready for worker in self._workers):
+                self._all_ready.set()
+                self._settled.set()
+
+    def _check_workers(self):
+        now = time.monotonic()
+        lost: List[int] = []
+        with self._lock:
+            if self._closed:
+                return
+            for worker in self._workers:
+                if worker.proc is not None and not worker.proc.is_alive():
+                    # 준비 전에 죽었으면 (모델 로드 실패 등) 재시작 간격을 늘림
+                    if not worker.ready:
+                        worker.failures += 1
+                    delay = min(RESTART_BACKOFF_MAX, 2 ** worker.failures - 1)
+                    logs.event(
+                        logger, logging.ERROR, "추론 워커 종료 감지 → 재시작",
+                        pid=worker.proc.pid, exitcode=worker.proc.exitcode,
+                        lost_tasks=len(worker.inflight), restart_in_s=delay,
+                    )
+                    worker.tasks.close()
+                    worker.proc, worker.ready = None, False
+                    worker.restart_at = now + delay
+                    self._all_ready.clear()
+                    # 이 워커에 배정된 작업만 실패 처리 (다른 워커의 작업은 그대로)
+                    lost.extend(worker.inflight)
+                    worker.inflight.clear()
+                if worker.proc is None and now >= worker.restart_at:
+                    self._spawn(worker)
+            futures = [self._futures.pop(task_id, None) for task_id in lost]
+            for task_id in lost:
+                self._owners.pop(task_id, None)
+
+        error = RuntimeError("추론 워커 프로세스가 종료되었습니다.")
+        for future in futures:
+            if future is not None:
+                future.set_exception(error)
+
+    def _fail_pending(self, error: Exception):
+        with self._lock:
+            futures, self._futures = self._futures, {}
+            self._owners = {}
+            for worker in self._workers:
+                worker.inflight.clear()
+        for future in futures.values():
+            future.set_exception(error)
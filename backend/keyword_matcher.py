@@ -0,0 +1,95 @@
+import hashlib
+import json
+from collections import deque
+from pathlib import Path
+from typing import Dict, List
+
+
+# =========================
+# 다중 키워드 매처 (Aho-Corasick)
+# =========================
+class KeywordMatcher:
+    """
+    카테고리별 키워드 목록을 하나의 Aho-Corasick 오토마톤으로 컴파일
+    - 텍스트를 한 번만 훑어 카테고리별로 "등장한 키워드 수"를 셈
+    - 목록에 같은 키워드가 두 번 있으면 두 번 셈 (`keyword in text` 반복과 동일)
+    """
+
+    def __init__(self, rules: Dict[str, List[str]]):
+        self.categories = list(rules)
+        # 사전 내용 해시 (결과 캐시 버전 구분용)
+        self.digest = hashlib.sha256(
+            json.dumps(rules, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:12]
+
+        # 키워드별 카테고리 가중치 (중복 등록 횟수)
+        patterns: Dict[str, Dict[str, int]] = {}
+        for category, keywords in rules.items():
+            for keyword in keywords:
+                if keyword:
+                    weights = patterns.setdefault(keyword, {})
+                    weights[category] = weights.get(category, 0) + 1
+        self._weights = list(patterns.values())
+
+        # 트라이
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for pattern_id, keyword in enumerate(patterns):
+            node = 0
+            for char in keyword:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    outputs.append([])
+                node = next_node
+            outputs[node].append(pattern_id)
+
+        # 실패 링크를 미리 펼쳐 완전한 DFA 전이표로 만듦 (BFS라 실패 상태가 먼저 완성됨)
+        # → 스캔 시 문자당 dict 조회 한 번, 전이가 없으면 루트로
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [{} for _ in goto]
+        delta[0] = dict(goto[0])
+        pending = deque(goto[0].values())
+        while pending:
+            node = pending.popleft()
+            delta[node] = {**delta[fail[node]], **goto[node]}
+            for char, child in goto[node].items():
+                fail[child] = delta[fail[node]].get(char, 0)
+                outputs[child].extend(outputs[fail[child]])
+                pending.append(child)
+
+        self._delta = delta
+        self._outputs = [frozenset(output) for output in outputs]
+
+    @classmethod
+    def from_file(cls, path) -> "KeywordMatcher":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def match(self, text: str) -> frozenset:
+        """텍스트에 등장한 키워드 id 집합"""
+        delta, outputs = self._delta, self._outputs
+        matched = set()
+        node = 0
+        for char in text:
+            node = delta[node].get(char, 0)
+            if outputs[node]:
+                matched |= outputs[node]
+        return frozenset(matched)
+
+    def count(self, text: str) -> Dict[str, int]:
+        """카테고리별 등장 키워드 수"""
+        counts = dict.fromkeys(self.categories, 0)
+        for pattern_id in self.match(text):
+            for category, weight in self._weights[pattern_id].items():
+                counts[category] += weight
+        return counts
+
+    def count_many(self, texts: List[str]) -> List[Dict[str, int]]:
+        """여러 텍스트의 카테고리별 등장 키워드 수 (대량 등록용)"""
+        return [self.count(text) for text in texts]
+
+
+DEFAULT_RULES_PATH = Path(__file__).with_name("keyword_rules.json")
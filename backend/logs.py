@@ -0,0 +1,147 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+
+# =========================
+# 로그 설정 (환경 변수)
+# =========================
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# 리뷰별 감성분석 로그를 남길 비율 (0이면 끔, 1이면 전부)
+REVIEW_SAMPLE_RATE = float(os.getenv("LOG_REVIEW_SAMPLE_RATE", "0.01"))
+
+# 단계가 이 시간(ms)을 넘을 때만 느린 단계 로그
+# "500" 또는 "default=500,onnx_run=300,db_commit=100" 형식
+LOG_SLOW_STAGE_MS = os.getenv("LOG_SLOW_STAGE_MS", "500")
+LOG_SLOW_REQUEST_MS = float(os.getenv("LOG_SLOW_REQUEST_MS", "1000"))
+
+
+def _parse_thresholds(spec: str) -> Dict[str, float]:
+    thresholds = {}
+    for part in spec.split(","):
+        name, _, value = part.rpartition("=")
+        if value.strip():
+            thresholds[name.strip() or "default"] = float(value)
+    return thresholds
+
+
+SLOW_STAGE_THRESHOLDS = _parse_thresholds(LOG_SLOW_STAGE_MS)
+
+
+# =========================
+# JSON 포맷 / 큐 핸들러
+# =========================
+class JsonFormatter(logging.Formatter):
+    """한 줄에 JSON 객체 하나 (ts, level, logger, msg + 구조화 필드)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:  # 큐 핸들러에서 미리 문자열로 바꾼 예외
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    로그 레코드를 큐에만 넣고 바로 반환 (포맷 / stdout 쓰기는 백그라운드 스레드)
+    - 큐가 가득 차면 기다리지 않고 버리고 개수만 셈
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # JSON 직렬화는 리스너 스레드에서 하도록 메시지 합치기 / 예외 문자열화만 수행
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: str = LOG_LEVEL):
+    """
+    루트 로거를 큐 핸들러 하나로 교체하고 stdout JSON 출력 스레드 시작 (여러 번 불러도 한 번만)
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    root.handlers = [DroppingQueueHandler(log_queue)]
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=False)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """남은 로그를 모두 쓰고 출력 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# =========================
+# 로그 헬퍼
+# =========================
+def event(logger: logging.Logger, level: int, msg: str, exc_info=False, **fields):
+    """구조화 필드를 붙인 로그 (레벨이 꺼져 있으면 필드도 만들지 않음)"""
+    if logger.isEnabledFor(level):
+        logger.log(level, msg, exc_info=exc_info, extra={"fields": fields})
+
+
+def sample_review() -> bool:
+    """리뷰별 로그를 이번에 남길지 (REVIEW_SAMPLE_RATE 비율)"""
+    return REVIEW_SAMPLE_RATE > 0 and random.random() < REVIEW_SAMPLE_RATE
+
+
+_slow_logger = logging.getLogger("slow")
+
+
+def slow_stage(stage: str, seconds: float, **fields):
+    """단계 시간이 임계값을 넘었을 때만 경고 로그"""
+    threshold = SLOW_STAGE_THRESHOLDS.get(stage, SLOW_STAGE_THRESHOLDS.get("default"))
+    if threshold is not None and seconds * 1000 > threshold:
+        event(_slow_logger, logging.WARNING, "느린 단계", stage=stage,
+              ms=round(seconds * 1000, 1), threshold_ms=threshold, **fields)
+
+
+def slow_request(method: str, route: str, status: int, seconds: float):
+    if seconds * 1000 > LOG_SLOW_REQUEST_MS:
+        event(_slow_logger, logging.WARNING, "느린 요청", method=method, route=route,
+              status=status, ms=round(seconds * 1000, 1), threshold_ms=LOG_SLOW_REQUEST_MS)
@@ -1,75 +1,367 @@
-from fastapi import FastAPI, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+import asyncio
+import hmac
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
 
-from database import Base, engine, SessionLocal
+from database import Base, engine, AsyncSessionLocal, SessionLocal
+from migrations import run_migrations
 import crud
+import logs
+import metrics
+import scoring
+import seed
+import sentiment
+import versions
 from schemas import (
+    CatalogPage,
     MovieCreate,
     MovieOut,
     ReviewCreate,
     ReviewOut,
+    BulkReviewResponse,
+    PaginatedReviews,
+    MovieReviewPage,
+    SeedRequest,
+    SeedResponse,
 )
 
 
+# 로그는 큐에 넣고 별도 스레드가 stdout에 JSON 한 줄씩 출력 (요청 / 추론 스레드를 막지 않음)
+logs.setup_logging()
+
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scoring.worker.start()
+
+    # 모델 로드 + 워밍업은 백그라운드에서 (그동안 /healthz는 응답, /readyz는 503)
+    threading.Thread(target=sentiment.warmup, name="sentiment-warmup", daemon=True).start()
+
+    yield
+
+    if sentiment.pool is not None:
+        sentiment.pool.shutdown()
+    logs.shutdown_logging()
+
+
+app = FastAPI(title="Movie Review Sentiment API", lifespan=lifespan)
+app.add_middleware(metrics.MetricsMiddleware)
 
-app = FastAPI(title="Movie Review Sentiment API")
+
+# ---------- Health ----------
+@app.get("/healthz")
+async def healthz():
+    """프로세스 생존 확인 (모델 로드 여부와 무관)"""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """모델 로드 + 워밍업이 끝난 뒤에만 ready (로드밸런서 트래픽 투입 기준)"""
+    if not sentiment.is_ready():
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus 텍스트 형식 메트릭 (요청 / 단계별 시간, 배치 크기, 라벨 수, DB 대기)"""
+    return PlainTextResponse(
+        metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 # ---------- DB ----------
-def get_db():
-    db = SessionLocal()
-    try:
+# 모든 라우트는 async: DB는 비동기 엔진(crud 함수는 run_sync로 호출),
+# 감성분석은 추론 전용 executor에서 실행되어 조회 요청을 막지 않음
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        # 커넥션을 미리 받아 두면서 풀에서 기다린 시간을 기록
+        with metrics.DB_CHECKOUT_SECONDS.time():
+            await db.connection()
         yield db
-    finally:
-        db.close()
+
+
+# ---------- 조건부 GET (ETag) ----------
+# 라우트 dependencies로 붙여 get_db보다 먼저 실행 → 304면 DB 커넥션도 받지 않음
+# 버전은 DB를 읽기 전에 잡으므로, 그 사이 쓰기가 있어도 다음 요청에서 새 ETag로 바뀜
+def _conditional(request: Request, response: Response, etag: str):
+    if not versions.ETAGS_ENABLED:
+        return
+    headers = {"ETag": etag, "Cache-Control": versions.CACHE_CONTROL}
+    if versions.matches(request.headers.get("if-none-match", ""), etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+def _query_key(request: Request):
+    return tuple(sorted(request.query_params.multi_items()))
+
+
+async def catalog_etag(request: Request, response: Response):
+    if versions.ETAGS_ENABLED:
+        await versions.refresh_shared()
+    _conditional(request, response, versions.catalog_etag(request.url.path, _query_key(request)))
+
+
+async def movie_etag(movie_id: int, request: Request, response: Response):
+    if versions.ETAGS_ENABLED:
+        await versions.refresh_shared()
+    _conditional(request, response, versions.movie_etag(movie_id, request.url.path, _query_key(request)))
 
 
 # ---------- Movie ----------
-@app.get("/movies", response_model=List[MovieOut])
-def list_movies(db: Session = Depends(get_db)):
-    return crud.get_movies(db)
+@app.get("/movies", response_model=List[MovieOut], dependencies=[Depends(catalog_etag)])
+async def list_movies(db: AsyncSession = Depends(get_db)):
+    return await db.run_sync(crud.get_movies)
 
 
-@app.get("/movies/{movie_id}", response_model=MovieOut)
-def get_movie(movie_id: int, db: Session = Depends(get_db)):
-    movie = crud.get_movie(db, movie_id)
+@app.get("/catalog", response_model=CatalogPage, dependencies=[Depends(catalog_etag)])
+async def catalog(
+    sort: Literal["recent", "score", "reviews", "title"] = "recent",
+    limit: int = Query(30, ge=1, le=100),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    영화 목록 화면용 카탈로그 (카드 정보 + 평균 별점 + 리뷰 수, 쿼리 한 번)
+    - sort: recent(최신 등록순) / score(평균 별점순) / reviews(리뷰 많은 순) / title(제목순)
+    - 응답의 next_cursor를 after로 넘기면 다음 페이지 (같은 sort로)
+    """
+    try:
+        return await db.run_sync(crud.get_catalog, sort=sort, limit=limit, after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/movies/{movie_id}", response_model=MovieOut, dependencies=[Depends(movie_etag)])
+async def get_movie(movie_id: int, db: AsyncSession = Depends(get_db)):
+    movie = await db.run_sync(crud.get_movie, movie_id)
     if not movie:
         raise HTTPException(status_code=404, detail="영화를 찾을 수 없습니다.")
     return movie
 
 
 @app.post("/movies", response_model=MovieOut)
-def add_movie(movie: MovieCreate, db: Session = Depends(get_db)):
-    return crud.create_movie(db, movie)
+async def add_movie(movie: MovieCreate, db: AsyncSession = Depends(get_db)):
+    return await db.run_sync(crud.create_movie, movie)
 
 
 @app.delete("/movies/{movie_id}")
-def delete_movie(movie_id: int, db: Session = Depends(get_db)):
-    crud.delete_movie(db, movie_id)
+async def delete_movie(movie_id: int, db: AsyncSession = Depends(get_db)):
+    await db.run_sync(crud.delete_movie, movie_id)
     return {"status": "deleted"}
 
 
 # ---------- Review ----------
 @app.post("/reviews", response_model=ReviewOut)
-def add_review(review: ReviewCreate, db: Session = Depends(get_db)):
-    return crud.create_review(db, review)
+async def add_review(
+    review: ReviewCreate,
+    defer: Optional[bool] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    리뷰 등록
+    - defer=true면 감성분석 전 pending 상태로 바로 반환하고 백그라운드에서 채점
+    """
+    if defer is None:
+        defer = scoring.ASYNC_SCORING
+
+    result = None if defer else await sentiment.analyze_sentiment_async(review.content)
+    created = await db.run_sync(crud.create_review, review, defer=defer, sentiment=result)
+    if defer:
+        scoring.worker.enqueue(created.id)
+    return created
 
 
-@app.get("/reviews", response_model=List[ReviewOut])
-def recent_reviews(db: Session = Depends(get_db)):
-    return crud.get_recent_reviews(db)
+async def _iter_bulk_rows(request: Request):
+    """
+    요청 본문을 (순번, 원본 객체) 단위로 읽음
+    - application/x-ndjson: 한 줄에 리뷰 하나, 스트리밍으로 읽음
+    - 그 외: 리뷰 객체의 JSON 배열
+    """
+    content_type = request.headers.get("content-type", "")
+
+    if "ndjson" in content_type or "jsonl" in content_type:
+        index = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, line
+                    index += 1
+        if buffer.strip():
+            yield index, buffer
+        return
+
+    try:
+        rows = await request.json()
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="JSON 형식이 올바르지 않습니다.")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=422, detail="리뷰 배열을 보내주세요.")
+    for index, row in enumerate(rows):
+        yield index, row
 
 
-@app.get("/movies/{movie_id}/reviews", response_model=List[ReviewOut])
-def movie_reviews(movie_id: int, db: Session = Depends(get_db)):
-    return crud.get_reviews_by_movie(db, movie_id)
+def _parse_bulk_row(row) -> ReviewCreate:
+    if isinstance(row, (bytes, str)):
+        return ReviewCreate.model_validate_json(row)
+    return ReviewCreate.model_validate(row)
+
+
+@app.post("/reviews/bulk", response_model=BulkReviewResponse)
+async def add_reviews_bulk(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    리뷰 대량 등록 (JSON 배열 또는 NDJSON)
+    - BULK_CHUNK_SIZE개씩 배치 감성분석 + bulk insert + commit
+    """
+    results = []
+    chunk = []
+
+    async def flush():
+        scores = await sentiment.analyze_sentiment_batch_async([data.content for _, data in chunk])
+        results.extend(await db.run_sync(crud.bulk_create_reviews, chunk[:], scores))
+        chunk.clear()
+
+    async for index, row in _iter_bulk_rows(request):
+        try:
+            chunk.append((index, _parse_bulk_row(row)))
+        except ValidationError as e:
+            err = e.errors()[0]
+            loc = ".".join(str(part) for part in err["loc"])
+            message = f"{loc}: {err['msg']}" if loc else err["msg"]
+            results.append({"index": index, "id": None, "error": message})
+            continue
+        if len(chunk) >= crud.BULK_CHUNK_SIZE:
+            await flush()
+    if chunk:
+        await flush()
+
+    results.sort(key=lambda r: r["index"])
+    created = sum(1 for r in results if r["error"] is None)
+    return {"created": created, "failed": len(results) - created, "results": results}
+
+
+@app.get("/reviews", response_model=PaginatedReviews)
+async def recent_reviews(
+    limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        return await db.run_sync(crud.get_recent_reviews, limit=limit, after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/reviews/{review_id}", response_model=ReviewOut)
+async def get_review(review_id: int, db: AsyncSession = Depends(get_db)):
+    review = await db.run_sync(crud.get_review, review_id)
+    if not review:
+        raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다.")
+    return review
+
+
+async def _read_review(review_id: int):
+    # 롱 폴링 대기 중에는 커넥션 / 트랜잭션을 잡고 있지 않도록 조회할 때만 짧은 세션을 엶
+    async with AsyncSessionLocal() as db:
+        with metrics.DB_CHECKOUT_SECONDS.time():
+            await db.connection()
+        return await db.run_sync(crud.get_review, review_id)
+
+
+@app.get("/reviews/{review_id}/wait", response_model=ReviewOut)
+async def wait_review(review_id: int, timeout: float = 10.0):
+    """
+    채점이 끝날 때까지 최대 timeout초 대기 후 리뷰 반환 (롱 폴링)
+    - 대기는 세션 없이 채점 워커의 이벤트로, DB는 조회할 때만 짧게 사용
+    """
+    deadline = time.monotonic() + min(timeout, 60.0)
+
+    while True:
+        # 이벤트를 먼저 잡아둔 뒤 조회해야 그 사이 완료된 채점을 놓치지 않음
+        event = scoring.worker.get_event(review_id)
+        review = await _read_review(review_id)
+        if not review:
+            raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다.")
+        if review.sentiment_label != crud.PENDING_LABEL or time.monotonic() >= deadline:
+            return review
+
+        # 다른 프로세스에서 등록된 리뷰면 이벤트가 없으므로 주기적으로 다시 조회
+        poll_until = min(deadline, time.monotonic() + (0.5 if event is None else 60.0))
+        while time.monotonic() < poll_until and not (event and event.is_set()):
+            await asyncio.sleep(0.05)
+
+
+@app.get("/movies/{movie_id}/reviews", response_model=MovieReviewPage, dependencies=[Depends(movie_etag)])
+async def movie_reviews(
+    movie_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    영화별 리뷰 (최신순 커서 페이지네이션)
+    - 응답의 next_cursor를 after로 넘기면 다음 페이지
+    - total(전체 리뷰 수)과 avg_score(영화 평균 별점)를 함께 반환
+    """
+    try:
+        page = await db.run_sync(crud.get_reviews_by_movie, movie_id, limit=limit, after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page is None:
+        raise HTTPException(status_code=404, detail="영화를 찾을 수 없습니다.")
+    return page
 
 
 @app.delete("/reviews/{review_id}")
-def delete_review_endpoint(review_id: int, db: Session = Depends(get_db)):
-    result = crud.delete_review(db, review_id)
+async def delete_review_endpoint(review_id: int, db: AsyncSession = Depends(get_db)):
+    result = await db.run_sync(crud.delete_review, review_id)
     if result is None:
         raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다.")
     return result
+
+
+# ---------- Admin ----------
+def _run_seed(request: SeedRequest) -> dict:
+    with SessionLocal() as db:
+        return seed.seed(db, request.movies, request.reviews_per_movie, stub=request.stub)
+
+
+@app.post("/admin/seed", response_model=SeedResponse)
+async def admin_seed(request: SeedRequest, x_admin_token: Optional[str] = Header(None)):
+    """
+    데모 / 부하 테스트용 시드 데이터 생성 (영화 movies개 + 영화마다 리뷰 reviews_per_movie개)
+    - ADMIN_TOKEN이 설정돼 있고 X-Admin-Token 헤더가 같을 때만 허용 (설정 안 됐으면 항상 403)
+    - 한 번에 SEED_MAX_MOVIES편 / SEED_MAX_REVIEWS개까지 (더 큰 데이터는 seed.py CLI로)
+    """
+    if not seed.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="ADMIN_TOKEN이 설정되지 않아 시드 API가 비활성화되어 있습니다.")
+    if not hmac.compare_digest(x_admin_token or "", seed.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 올바르지 않습니다.")
+    if request.movies > seed.SEED_MAX_MOVIES:
+        raise HTTPException(status_code=400, detail=f"영화는 한 번에 {seed.SEED_MAX_MOVIES}편까지 만들 수 있습니다.")
+    if request.movies * request.reviews_per_movie > seed.SEED_MAX_REVIEWS:
+        raise HTTPException(status_code=400, detail=f"리뷰는 한 번에 {seed.SEED_MAX_REVIEWS}개까지 만들 수 있습니다.")
+
+    # 배치 채점 + bulk insert는 동기 세션으로 별도 스레드에서 (이벤트 루프를 막지 않음)
+    return await asyncio.to_thread(_run_seed, request)
+
+
+# ---------- Sentiment ----------
+@app.get("/sentiment/cache")
+async def sentiment_cache_stats():
+    return sentiment.cache.stats()
@@ -0,0 +1,215 @@
+import bisect
+import collections
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+import logs
+
+
+# =========================
+# 메트릭 (Prometheus 텍스트 형식)
+# =========================
+# 요청 / 단계별 소요 시간 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """단조 증가 카운터 (라벨 값 조합별)"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in values
+        ]
+
+
+class Histogram:
+    """
+    누적 버킷 히스토그램 (라벨 값 조합별)
+    - observe는 버킷 위치를 찾은 뒤 짧게 잠금만 잡음 (잠금 안에서 I/O 없음)
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨별 [버킷별 개수..., +Inf 개수], 합계
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(labels)
+            if counts is None:
+                counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+                self._sums[labels] = 0.0
+            counts[index] += 1
+            self._sums[labels] += value
+
+    @contextmanager
+    def time(self, *labels: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            snapshot = [(labels, list(counts), self._sums[labels]) for labels, counts in self._counts.items()]
+
+        lines = []
+        for labels, counts, total in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_SECONDS = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route", "status"),
+))
+STAGE_SECONDS = registry.register(Histogram(
+    "review_pipeline_stage_seconds",
+    "리뷰 처리 단계별 시간 (tokenize, onnx_run, postprocess, db_commit, db_refresh)",
+    ("stage",),
+))
+MODEL_LOAD_SECONDS = registry.register(Histogram(
+    "sentiment_model_load_seconds", "감성분석 모델 로드 시간 (프로세스별 한 번)",
+    buckets=(0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0),
+))
+BATCH_SIZE = registry.register(Histogram(
+    "sentiment_inference_batch_size", "추론 배치 하나에 들어간 리뷰 수",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+))
+LABELS_TOTAL = registry.register(Counter(
+    "sentiment_labels_total", "모델이 채점한 리뷰 수 (라벨별, 캐시 적중 제외)", ("label",),
+))
+DB_CHECKOUT_SECONDS = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "API 요청이 DB 커넥션을 얻기까지 기다린 시간",
+))
+
+
+@contextmanager
+def stage(name: str):
+    """리뷰 처리 단계 하나의 시간 기록 (임계값을 넘으면 느린 단계 로그)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        STAGE_SECONDS.observe(seconds, name)
+        logs.slow_stage(name, seconds)
+
+
+def record_batch(timings: Dict[str, float], results: Sequence[Tuple[str, float, float]]):
+    """추론 배치 하나의 단계별 시간 / 배치 크기 / 라벨 수 기록 (프로세스 풀 워커 결과 포함)"""
+    for name, seconds in timings.items():
+        STAGE_SECONDS.observe(seconds, name)
+        logs.slow_stage(name, seconds, batch_size=len(results))
+    BATCH_SIZE.observe(len(results))
+    for label, count in collections.Counter(label for label, _, _ in results).items():
+        LABELS_TOTAL.inc(label, amount=count)
+
+
+# =========================
+# 요청 시간 미들웨어 (순수 ASGI)
+# =========================
+class MetricsMiddleware:
+    """
+    라우트 템플릿(/movies/{movie_id} 등)별 요청 시간 기록
+    - 라우터가 scope["route"]를 채우므로 응답 후에 경로 템플릿을 읽음
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            seconds = time.perf_counter() - started
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_SECONDS.observe(seconds, scope["method"], route, str(status))
+            logs.slow_request(scope["method"], route, status, seconds)
@@ -0,0 +1,55 @@
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
+
+import crud
+import logs
+from database import SessionLocal
+from models import Movie, Review
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# 스키마 마이그레이션
+# =========================
+# create_all은 이미 있는 테이블에 컬럼을 추가하지 않으므로 여기서 보충
+def _add_missing_columns(engine: Engine, model) -> list:
+    table = model.__table__
+    existing = {column["name"] for column in inspect(engine).get_columns(table.name)}
+
+    added = []
+    with engine.begin() as conn:
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+            conn.execute(text(ddl))
+            added.append(column.name)
+    return added
+
+
+def _create_missing_indexes(engine: Engine, model):
+    # 식 인덱스는 리플렉션이 안 돼 checkfirst로 확인할 수 없으므로 IF NOT EXISTS로 생성
+    with engine.begin() as conn:
+        for index in model.__table__.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def run_migrations(engine: Engine):
+    added = _add_missing_columns(engine, Movie)
+    _create_missing_indexes(engine, Movie)
+    _create_missing_indexes(engine, Review)
+
+    # 영화 집계 컬럼이 새로 생겼으면 기존 리뷰로 채움
+    if added:
+        logs.event(logger, logging.INFO, "movies 컬럼 추가 → 리뷰 집계 재계산", columns=added)
+        with SessionLocal() as db:
+            crud.recompute_movie_stats(db)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Index, case, literal_column
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -17,9 +17,37 @@ class Movie(Base):
     poster_url = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # 리뷰 집계 (감성분석이 끝난 리뷰만, crud에서 리뷰 등록/삭제와 같은 트랜잭션으로 갱신)
+    review_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    positive_count = Column(Integer, nullable=False, default=0, server_default="0")
+    neutral_count = Column(Integer, nullable=False, default=0, server_default="0")
+    negative_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # 감성분석 대기 중인 리뷰 수 (전체 리뷰 수 = review_count + pending_count)
+    pending_count = Column(Integer, nullable=False, default=0, server_default="0")
+
 
     reviews = relationship("Review", back_populates="movie", cascade="all, delete")
 
+    @property
+    def avg_score(self):
+        if not self.review_count:
+            return None
+        return round(self.score_sum / self.review_count, 2)
+
+
+# 카탈로그 평균 별점 정렬 키 (리뷰가 없으면 -1 → 내림차순에서 맨 뒤)
+# 식 인덱스를 타려면 쿼리의 식이 인덱스 식과 같아야 하므로 상수도 바인드 파라미터 없이 그대로 씀
+avg_score_key = case(
+    (Movie.review_count > literal_column("0"), Movie.score_sum / Movie.review_count),
+    else_=literal_column("-1"),
+)
+
+# 카탈로그 정렬 / 키셋 페이지네이션용 인덱스
+Index("ix_movies_avg_score", avg_score_key, Movie.id)
+Index("ix_movies_review_count", Movie.review_count, Movie.id)
+Index("ix_movies_title", Movie.title, Movie.id)
+
 
 class Review(Base):
     __tablename__ = "reviews"
@@ -37,6 +65,24 @@ class Review(Base):
 
     movie = relationship("Movie", back_populates="reviews")
 
+    # 키셋 페이지네이션용 복합 인덱스 (영화별 / 전체 최신순)
+    __table_args__ = (
+        Index("ix_reviews_movie_created", "movie_id", "created_at", "id"),
+        Index("ix_reviews_created", "created_at", "id"),
+    )
+
+
+class DataVersion(Base):
+    """
+    API 프로세스 밖(seed.py CLI, benchmarks.generate_data 등)의 대량 쓰기를 알리는 한 행짜리 카운터
+    - 쓰는 쪽이 데이터와 같은 트랜잭션에서 올리고, API의 ETag 계산이 주기적으로 읽음
+    """
+    __tablename__ = "data_version"
+
+
+    id = Column(Integer, primary_key=True)
+    generation = Column(Integer, nullable=False, default=0, server_default="0")
+
 
 class MovieCreate(BaseModel):
     title: str
@@ -26,10 +26,35 @@ class MovieOut(BaseModel):
     poster_url: Optional[str]
     created_at: Optional[dt.datetime] = None
 
+    # 리뷰 집계 (감성분석 완료된 리뷰 기준)
+    avg_score: Optional[float] = None
+    review_count: int = 0
+    positive_count: int = 0
+    neutral_count: int = 0
+    negative_count: int = 0
+
     class Config:
         from_attributes = True
 
 
+class CatalogItem(BaseModel):
+    """영화 목록 카드 하나 (표시 필드 + 평균 별점 / 리뷰 수)"""
+    id: int
+    title: str
+    release_date: Optional[dt.date]
+    director: Optional[str]
+    genre: Optional[str]
+    poster_url: Optional[str]
+    avg_score: Optional[float] = None
+    review_count: int = 0
+
+
+class CatalogPage(BaseModel):
+    items: List[CatalogItem]
+    total: int  # 전체 영화 수
+    next_cursor: Optional[str] = None  # 다음 페이지 요청 시 after로 전달
+
+
 # ---------- Review ----------
 class ReviewCreate(BaseModel):
     movie_id: int
@@ -42,9 +67,9 @@ class ReviewOut(BaseModel):
     movie_id: int
     author: str
     content: str
-    sentiment_label: str
-    sentiment_score: float
-    sentiment_confidence: float
+    sentiment_label: str  # 비동기 채점 대기 중이면 "pending"
+    sentiment_score: Optional[float] = None
+    sentiment_confidence: Optional[float] = None
     created_at: dt.datetime
 
     class Config:
@@ -53,5 +78,35 @@ class ReviewOut(BaseModel):
 
 class PaginatedReviews(BaseModel):
     items: List[ReviewOut]
-    total: int
+    total: Optional[int] = None  # 전체 최신 리뷰 목록에서는 계산하지 않음
+    next_cursor: Optional[str] = None  # 다음 페이지 요청 시 after로 전달
+
+
+class MovieReviewPage(PaginatedReviews):
+    avg_score: Optional[float] = None  # 영화 평균 별점 (감성분석 완료된 리뷰 기준)
+
+
+# ---------- Admin ----------
+class SeedRequest(BaseModel):
+    movies: int = Field(5, ge=0)
+    reviews_per_movie: int = Field(10, ge=0)
+    stub: bool = False  # true면 모델 대신 스텁 채점 (빠름, 결정적)
+
+
+class SeedResponse(BaseModel):
+    movies: int
+    reviews: int
+    scoring: str
+    elapsed_s: float
+
+
+class BulkReviewResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
 
+class BulkReviewResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkReviewResult]
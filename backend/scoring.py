@@ -0,0 +1,91 @@
+import logging
+import os
+import queue
+import threading
+from typing import Dict, List, Optional
+
+import crud
+import logs
+from database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# 비동기 채점 설정
+# =========================
+# true면 POST /reviews가 기본적으로 감성분석을 기다리지 않고 바로 반환
+ASYNC_SCORING = os.getenv("REVIEW_ASYNC_SCORING", "false").lower() in ("1", "true", "yes")
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "2"))
+SCORING_BATCH_SIZE = int(os.getenv("SCORING_BATCH_SIZE", "32"))
+
+
+# =========================
+# 백그라운드 채점 워커
+# =========================
+class ScoringWorker:
+    """
+    pending 상태로 저장된 리뷰를 백그라운드 스레드에서 배치 채점
+    - 리뷰 id별 threading.Event로 채점 완료를 알림
+    """
+
+    def __init__(self, num_workers: int, batch_size: int):
+        self.num_workers = num_workers
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[int]" = queue.Queue()
+        self._events: Dict[int, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        if self._threads:
+            return
+
+        for i in range(self.num_workers):
+            thread = threading.Thread(
+                target=self._run, name=f"review-scoring-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        # 재시작 전에 채점되지 못한 리뷰 다시 등록
+        with SessionLocal() as db:
+            for review_id in crud.get_pending_review_ids(db):
+                self.enqueue(review_id)
+
+    def enqueue(self, review_id: int):
+        with self._lock:
+            self._events.setdefault(review_id, threading.Event())
+        self._queue.put(review_id)
+
+    def get_event(self, review_id: int) -> Optional[threading.Event]:
+        with self._lock:
+            return self._events.get(review_id)
+
+    def _take_batch(self) -> List[int]:
+        review_ids = [self._queue.get()]
+        while len(review_ids) < self.batch_size:
+            try:
+                review_ids.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return review_ids
+
+    def _run(self):
+        while True:
+            review_ids = self._take_batch()
+            try:
+                with SessionLocal() as db:
+                    crud.score_pending_reviews(db, review_ids)
+            except Exception:
+                logs.event(logger, logging.ERROR, "리뷰 채점 실패", exc_info=True, review_ids=review_ids)
+            finally:
+                # 실패해도 대기 중인 클라이언트는 깨워서 현재 상태를 다시 조회하게 함
+                with self._lock:
+                    events = [self._events.pop(review_id, None) for review_id in review_ids]
+                for event in events:
+                    if event is not None:
+                        event.set()
+
+
+worker = ScoringWorker(SCORING_WORKERS, SCORING_BATCH_SIZE)
@@ -0,0 +1,217 @@
+"""
+데모 / 스테이징 / 부하 테스트용 시드 데이터 생성
+
+    cd backend
+    python seed.py                                      # 샘플 영화 5개 + 영화당 리뷰 10개 (모델 채점)
+    DATABASE_URL=sqlite:////tmp/staging.db python seed.py --movies 2000 --reviews-per-movie 1000 --stub
+
+- 샘플 영화(포스터 포함)를 먼저 만들고, 더 필요하면 합성 영화로 채움 (이미 있는 샘플 제목은 건너뜀)
+- 리뷰는 청크 단위로 배치 감성분석 → bulk insert → commit, 끝나면 새 영화들의 집계 계산
+- --stub: 모델 대신 텍스트 해시 기반 스텁 채점 (같은 텍스트 → 항상 같은 결과, 모델 로드 없음)
+"""
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+import crud
+import versions
+from database import Base, SessionLocal, engine
+from migrations import run_migrations
+from models import Movie, Review
+from sentiment import analyze_sentiment_batch, stub_sentiment_batch
+
+
+# =========================
+# 시드 설정 (환경 변수)
+# =========================
+# POST /admin/seed에 필요한 X-Admin-Token 값 (비어 있으면 API로는 시드 불가, CLI만 사용)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# POST /admin/seed 한 번에 만들 수 있는 최대 영화 수 / 리뷰 수 (CLI는 제한 없음)
+SEED_MAX_MOVIES = int(os.getenv("SEED_MAX_MOVIES", "100"))
+SEED_MAX_REVIEWS = int(os.getenv("SEED_MAX_REVIEWS", "100000"))
+
+# 한 트랜잭션에 넣는 리뷰 수
+SEED_CHUNK_SIZE = 10_000
+
+
+# =========================
+# 샘플 데이터
+# =========================
+SAMPLE_MOVIES = [
+    ("아바타: 불과 재", "2025-12-20", "제임스 카메론", "SF", "https://i.namu.wiki/i/UyN7wDQJ2QnXo-RivyWd573b1K-YZ9fAFUr0nyWMZLc_vd1NW45XQBBslwhUIfrHGyqSLIqryRYb9ItDci2hvc6C6TV1g822dsIAYcmw4VLWoPldfg-060N-9ua7vghptFaEAefg7sNzxvseXqsksg.webp"),
+    ("탈주", "2024-07-03", "이종필", "액션", "https://i.namu.wiki/i/GOCVqsctfY_ei_5gC38-8UlHqQ4ypixYpkfgGn_LcDsYpgelrJDMAlgxzrkwWZo0n0vnCcdgPgA7-_mNfScR5OkZuZU9JaGdNUZZyikeeUB19MlwR3VUdxaTjA4XHaUvyKP2LaGad9A4nVAi4ymAkg.webp"),
+    ("집으로 가는 길", "2013-12-12", "방은진", "드라마", "https://i.namu.wiki/i/O58yKrByuDlVcPA4TXIlytF98-4mBDnVGLloYTsQeqrkklOVqXkIR2rAySTDnLmWAb_Pe4VCSsVNEFDG4kWJOI4F9TrjcyL3DD26lpQBunOZaCl1z2DH5tjRABEyRXdMmcsUEYrryf--NoP9Ezd1lw.webp"),
+    ("전지적 독자 시점", "2025-07-23", "김병우", "판타지", "https://i.namu.wiki/i/78fa4oC92J13_-Z7Pw-_v_6TsLDJ2kBkTZqrfLm-ll9f_jgXP41H7UtUTXXCZpvTOZcIAsMqP3tsi6IfFvA2GFr8Cnto-mKubovE-MzWQeqcPVnG9LayEW46wv7UDm1lwnyYPxuiakPxi_LGLZccjQ.webp"),
+    ("극장판 짱구는 못말려: 초화려! 작열하는 떡잎마을 댄서즈", "2025-12-24", "하시모토 마사카즈", "애니메이션", "https://i.namu.wiki/i/yyOX12GcO3Z83hCYIxFvvjaUZnf9FshyOTeoT0s28URV1EhVWfDZ_349Mj6pyOQ3WuOK-oxRS9BHp_sP8hiZYq0aEGyMp8aNTlR6PwEGiZ4GNy_WtzkTC_i-PIha4yL5wusVyP5dsPhf3_aJ6zXWZg.webp"),
+]
+
+SAMPLE_REVIEWS = [
+    # 👍 매우 긍정
+    "스토리도 탄탄하고 연출이 정말 뛰어났어요. 시간 가는 줄 모르고 봤습니다.",
+    "배우들의 연기가 몰입감을 높여줘서 끝까지 재미있게 감상했어요.",
+    "영상미와 음악이 잘 어우러져서 극장에서 볼 가치가 충분한 작품이었습니다.",
+    "기대 이상으로 완성도가 높아서 다시 보고 싶은 영화예요.",
+
+    # 🙂 긍정
+    "전반적으로 재미있게 봤고, 몇몇 장면은 인상 깊었습니다.",
+    "조금 늘어지는 부분은 있었지만 전체적으로 만족스러웠어요.",
+    "가볍게 보기 좋은 영화라서 부담 없이 즐길 수 있었습니다.",
+
+    # 😐 중립
+    "무난한 영화였습니다. 나쁘지도 좋지도 않았어요.",
+    "스토리는 평범했지만 연출은 괜찮은 편이었습니다.",
+    "기대가 컸던 만큼 아쉬움도 조금 남는 작품이네요.",
+
+    # 🙁 부정
+    "스토리가 예상 가능해서 중간부터 흥미가 떨어졌습니다.",
+    "연출이 다소 산만해서 몰입하기 어려웠어요.",
+    "러닝타임에 비해 내용이 너무 얕게 느껴졌습니다.",
+
+    # 😡 매우 부정
+    "기대하고 봤는데 실망이 컸어요. 전개가 너무 엉성했습니다.",
+    "캐릭터의 행동이 이해되지 않아서 보는 내내 답답했어요.",
+    "끝까지 보기 힘들 정도로 지루했습니다.",
+]
+
+SYNTHETIC_GENRES = ["드라마", "액션", "코미디", "스릴러", "로맨스", "SF", "애니메이션", "공포"]
+
+
+# =========================
+# 시드 생성
+# =========================
+def _movie_rows(db: Session, count: int, rng: random.Random) -> List[dict]:
+    """샘플 영화(없는 제목만) + 부족한 만큼 합성 영화"""
+    existing = set(db.scalars(select(Movie.title)))
+    rows = [
+        {"title": title, "release_date": rd, "director": d, "genre": g, "poster_url": p}
+        for title, rd, d, g, p in SAMPLE_MOVIES[:count]
+        if title not in existing
+    ]
+
+    number = 0
+    while len(rows) < count and count > len(SAMPLE_MOVIES):
+        number += 1
+        title = f"샘플 영화 {number}"
+        if title in existing:
+            continue
+        release = datetime(2015, 1, 1) + timedelta(days=rng.randrange(3650))
+        rows.append({
+            "title": title,
+            "release_date": release.date().isoformat(),
+            "director": f"감독 {rng.randrange(500)}",
+            "genre": SYNTHETIC_GENRES[number % len(SYNTHETIC_GENRES)],
+            "poster_url": "",
+        })
+
+    now = datetime.utcnow()
+    for row in rows:
+        row["created_at"] = now
+    return rows
+
+
+def _score(texts: List[str], stub: bool):
+    """서로 다른 텍스트만 채점해 원래 순서대로 펼침"""
+    unique = list(dict.fromkeys(texts))
+    scores = stub_sentiment_batch(unique) if stub else analyze_sentiment_batch(unique)
+    by_text = dict(zip(unique, scores))
+    return [by_text[text] for text in texts]
+
+
+def seed(
+    db: Session,
+    movies: int = len(SAMPLE_MOVIES),
+    reviews_per_movie: int = 10,
+    stub: bool = False,
+    chunk_size: int = SEED_CHUNK_SIZE,
+    random_seed: Optional[int] = None,
+) -> dict:
+    """
+    영화 movies개 + 영화마다 리뷰 reviews_per_movie개 생성
+    - 리뷰는 chunk_size개씩 배치 채점 + bulk insert + commit
+    """
+    rng = random.Random(random_seed)
+    started = time.perf_counter()
+
+    rows = _movie_rows(db, movies, rng)
+    movie_ids = []
+    if rows:
+        movie_ids = db.scalars(insert(Movie).returning(Movie.id, sort_by_parameter_order=True), rows).all()
+        # CLI로 실행하면 API 프로세스의 메모리 카운터가 아니라 DB 공유 카운터로 알려짐
+        versions.bump_shared(db)
+        db.commit()
+        versions.bump_catalog()
+
+    # 리뷰 작성 시각은 최근 1년 안에 흩어 둠 (최신순 페이지가 의미 있도록)
+    now = datetime.utcnow()
+    span_seconds = 365 * 86400
+    inserted = 0
+    pending = []
+
+    def flush():
+        nonlocal inserted
+        scores = _score([row["content"] for row in pending], stub)
+        for row, (label, confidence, score) in zip(pending, scores):
+            row["sentiment_label"] = label
+            row["sentiment_confidence"] = confidence
+            row["sentiment_score"] = score
+        db.execute(insert(Review), pending)
+        versions.bump_shared(db)
+        db.commit()
+        inserted += len(pending)
+        pending.clear()
+
+    for movie_id in movie_ids:
+        for i in range(reviews_per_movie):
+            pending.append({
+                "movie_id": movie_id,
+                "author": f"user{i}",
+                "content": rng.choice(SAMPLE_REVIEWS),
+                "created_at": now - timedelta(seconds=rng.randrange(span_seconds)),
+            })
+            if len(pending) >= chunk_size:
+                flush()
+    if pending:
+        flush()
+
+    # 영화 집계는 적재가 끝난 뒤 새 영화들만 계산 (IN 목록이 너무 길지 않도록 나눠서)
+    for offset in range(0, len(movie_ids), 500):
+        crud.recompute_movie_stats(db, movie_ids[offset:offset + 500])
+
+    return {
+        "movies": len(movie_ids),
+        "reviews": inserted,
+        "scoring": "stub" if stub else "model",
+        "elapsed_s": round(time.perf_counter() - started, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--movies", type=int, default=len(SAMPLE_MOVIES))
+    parser.add_argument("--reviews-per-movie", type=int, default=10)
+    parser.add_argument("--stub", action="store_true", help="모델 대신 스텁 채점 (빠름, 결정적)")
+    parser.add_argument("--chunk-size", type=int, default=SEED_CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, help="난수 시드 (같은 값이면 같은 데이터)")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+    with SessionLocal() as db:
+        result = seed(
+            db, args.movies, args.reviews_per_movie,
+            stub=args.stub, chunk_size=args.chunk_size, random_seed=args.seed,
+        )
+    print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,23 @@
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
 import onnxruntime as ort
 import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple
-from transformers import BertTokenizer
+from typing import Dict, List, Optional, Tuple
+from transformers import BertTokenizer, BertTokenizerFast
 from huggingface_hub import snapshot_download
+import logs
+import metrics
+from inference_pool import InferencePool
+from keyword_matcher import DEFAULT_RULES_PATH, KeywordMatcher
+from sentiment_cache import SentimentCache, normalize_text
 
 # =========================
 # 모델 경로
@@ -14,63 +28,222 @@ CACHE_DIR = Path("/tmp/onnx_model")  # Render에서 안전
 _session = None
 _tokenizer = None
 
+logger = logging.getLogger(__name__)
 
 # =========================
-# 모델 로드 (한 번만 실행)
+# 마이크로 배칭 설정
 # =========================
-import onnxruntime as ort
-from pathlib import Path
-from transformers import BertTokenizer
-from huggingface_hub import snapshot_download
+# 동시에 들어온 리뷰를 최대 BATCH_WINDOW_MS 동안 모아 한 번에 추론
+BATCH_WINDOW_MS = float(os.getenv("SENTIMENT_BATCH_WINDOW_MS", "10"))
+MAX_BATCH_SIZE = int(os.getenv("SENTIMENT_MAX_BATCH_SIZE", "32"))
 
-HF_REPO_ID = "jinsugyeong/korean_movie_onnx"
-CACHE_DIR = Path("/tmp/onnx_model")
+# 토큰 길이 버킷 (짧은 리뷰는 짧은 배치끼리 묶어 패딩 비용 절감)
+MAX_SEQ_LENGTH = 256
+LENGTH_BUCKETS = tuple(
+    int(b) for b in os.getenv("SENTIMENT_LENGTH_BUCKETS", "32,64,128,256").split(",")
+)
 
-_session = None
-_tokenizer = None
+# Rust 기반 fast 토크나이저 사용 (같은 vocab, 기본은 순수 Python BertTokenizer)
+# 실제 모델 vocab으로 benchmarks.tokenizer_golden이 통과한 뒤에만 1로 켬
+FAST_TOKENIZER = os.getenv("SENTIMENT_FAST_TOKENIZER", "0") == "1"
 
+# 모델 로드 실패 / 추론 오류 시 기본값
+DEFAULT_RESULT = ("중립", 0.5, 3.0)
 
-def load_model():
-    global _session, _tokenizer
+# =========================
+# 추론 스레드 설정
+# =========================
+# 추론 전용 executor 크기 × ONNX intra-op 스레드 수 ≈ CPU 코어 수
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+ORT_INTRA_OP_THREADS = int(
+    os.getenv("ORT_INTRA_OP_THREADS", str(max(1, (os.cpu_count() or 1) // INFERENCE_WORKERS)))
+)
+ORT_INTER_OP_THREADS = int(os.getenv("ORT_INTER_OP_THREADS", "1"))
+
+# 멀티 프로세스 추론 풀 (0이면 API 프로세스 안의 executor에서 추론)
+# 워커 프로세스마다 자기 ONNX 세션 + INFERENCE_PROCESS_THREADS개의 intra-op 스레드
+INFERENCE_PROCESSES = int(os.getenv("INFERENCE_PROCESSES", "0"))
+INFERENCE_PROCESS_THREADS = int(
+    os.getenv(
+        "INFERENCE_PROCESS_THREADS",
+        str(max(1, (os.cpu_count() or 1) // max(1, INFERENCE_PROCESSES))),
+    )
+)
+
+# =========================
+# 모델 변형
+# =========================
+# fp32: 원본 model.onnx
+# optimized: ONNX Runtime 그래프 최적화 결과를 디스크에 저장해 다음 기동부터 재사용
+# int8: 동적 INT8 양자화 (CPU 추론 비용 절감, 최적화 그래프도 저장)
+MODEL_VARIANTS = ("fp32", "optimized", "int8")
+MODEL_VARIANT = os.getenv("SENTIMENT_MODEL_VARIANT", "fp32")
+if MODEL_VARIANT not in MODEL_VARIANTS:
+    raise ValueError(f"지원하지 않는 모델 변형입니다: {MODEL_VARIANT} ({', '.join(MODEL_VARIANTS)})")
+
+# 테스트 / 벤치마크용 결정적 스텁 모델 (모델 다운로드 없이 텍스트 해시로 logits 생성)
+STUB_MODEL = os.getenv("SENTIMENT_STUB", "0") == "1"
+STUB_LATENCY_MS = float(os.getenv("SENTIMENT_STUB_LATENCY_MS", "0"))  # 배치당 추론 시간 흉내
+
+# =========================
+# 결과 캐시 설정
+# =========================
+# 모델을 바꾸면 버전도 바꿔서 이전 결과가 재사용되지 않게 함
+# (양자화 모델은 점수가 조금 달라지므로 기본 버전에 변형 이름을 붙임)
+MODEL_VERSION = os.getenv(
+    "SENTIMENT_MODEL_VERSION",
+    "stub" if STUB_MODEL else HF_REPO_ID if MODEL_VARIANT != "int8" else f"{HF_REPO_ID}:int8",
+)
+CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "10000"))
+CACHE_DB_PATH = os.getenv("SENTIMENT_CACHE_DB", "")  # 비어 있으면 메모리 캐시만 사용
+
+# 앱 시작 시 길이 버킷별 워밍업 추론 횟수
+WARMUP_ROUNDS = int(os.getenv("SENTIMENT_WARMUP_ROUNDS", "2"))
+
+# 프로세스 풀 워밍업 대기 상한 (초) - 넘기면 워밍업 실패로 기록 (워커가 나중에 준비되면 /readyz는 ready)
+WARMUP_TIMEOUT = float(os.getenv("SENTIMENT_WARMUP_TIMEOUT", "600"))
+
+
+# =========================
+# 모델 로드 (한 번만 실행)
+# =========================
+_load_lock = threading.Lock()
+
+# 이 프로세스에서 모델 로드에 걸린 시간 (프로세스 풀 워커는 준비 완료 알림에 실어 보냄)
+model_load_seconds: Optional[float] = None
 
+
+def load_model():
     # ✅ 이미 로드됐으면 바로 반환
     if _session is not None and _tokenizer is not None:
         return _session, _tokenizer
 
-    print("🔄 감성분석 ONNX 모델 로드 시작")
+    # 추론 스레드 여러 개가 동시에 처음 호출해도 한 번만 로드
+    with _load_lock:
+        if _session is not None and _tokenizer is not None:
+            return _session, _tokenizer
+        return _load_model()
+
+
+def _load_model():
+    global _session, _tokenizer, model_load_seconds
+
+    logs.event(logger, logging.INFO, "감성분석 ONNX 모델 로드 시작", variant=MODEL_VARIANT)
+    started = time.perf_counter()
 
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
     model_path = CACHE_DIR / "model.onnx"
 
     # ✅ 모델 없을 때만 다운로드
     if not model_path.exists():
-        print("📥 모델 캐시 없음 → 다운로드")
+        logs.event(logger, logging.INFO, "모델 캐시 없음 → 다운로드", repo_id=HF_REPO_ID)
         snapshot_download(
             repo_id=HF_REPO_ID,
             local_dir=CACHE_DIR,
             local_dir_use_symlinks=False,  # Render 필수
         )
     else:
-        print("♻️ 캐시된 모델 사용")
+        logs.event(logger, logging.INFO, "캐시된 모델 사용", path=str(model_path))
 
     try:
-        # tokenizer
-        _tokenizer = BertTokenizer.from_pretrained(CACHE_DIR)
+        # tokenizer (같은 vocab.txt에서 fast / slow 중 선택)
+        tokenizer_class = BertTokenizerFast if FAST_TOKENIZER else BertTokenizer
+        _tokenizer = tokenizer_class.from_pretrained(CACHE_DIR)
 
-        # ONNX 세션
-        _session = ort.InferenceSession(
-            str(model_path),
-            providers=["CPUExecutionProvider"]
-        )
+        # ONNX 세션 (모델 변형 적용)
+        _session = create_session(MODEL_VARIANT, model_path)
 
-        print("✅ 감성분석 ONNX 모델 로드 완료")
+        model_load_seconds = time.perf_counter() - started
+        metrics.MODEL_LOAD_SECONDS.observe(model_load_seconds)
+        logs.event(
+            logger, logging.INFO, "감성분석 ONNX 모델 로드 완료",
+            variant=MODEL_VARIANT, seconds=round(model_load_seconds, 2),
+        )
         return _session, _tokenizer
 
-    except Exception as e:
-        print(f"❌ 모델 로드 실패: {e}")
+    except Exception:
+        logs.event(logger, logging.ERROR, "모델 로드 실패", exc_info=True, variant=MODEL_VARIANT)
         return None, None
 
 
+def _temp_path(path: Path) -> Path:
+    # 여러 프로세스가 동시에 만들어도 섞이지 않도록 pid별 임시 파일에 쓰고 교체
+    return path.with_name(f"{path.stem}.{os.getpid()}.tmp{path.suffix}")
+
+
+def _int8_path(model_path: Path) -> Path:
+    return model_path.with_name(f"{model_path.stem}.int8.onnx")
+
+
+def _optimized_path(model_path: Path) -> Path:
+    # 최적화 그래프는 ONNX Runtime 버전에 묶이므로 파일 이름에 버전을 넣음
+    return model_path.with_name(f"{model_path.stem}.optimized.ort{ort.__version__}.onnx")
+
+
+def _quantized_model_path(model_path: Path) -> Path:
+    """동적 INT8 양자화 모델 경로 (없으면 한 번 만들어 저장)"""
+    quantized_path = _int8_path(model_path)
+    if not quantized_path.exists():
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logs.event(logger, logging.INFO, "INT8 동적 양자화 모델 생성", path=str(quantized_path))
+        tmp_path = _temp_path(quantized_path)
+        quantize_dynamic(str(model_path), str(tmp_path), weight_type=QuantType.QInt8)
+        os.replace(tmp_path, quantized_path)
+    return quantized_path
+
+
+def session_model_path(variant: str = MODEL_VARIANT, model_path: Optional[Path] = None) -> Path:
+    """
+    create_session이 실제로 읽는 모델 파일 (파일을 만들지는 않음)
+    - optimized / int8: 저장된 최적화 그래프가 있으면 그 파일, 없으면 최적화 전 원본
+    """
+    model_path = model_path or CACHE_DIR / "model.onnx"
+    if variant == "int8":
+        model_path = _int8_path(model_path)
+    if variant != "fp32" and _optimized_path(model_path).exists():
+        return _optimized_path(model_path)
+    return model_path
+
+
+def create_session(variant: str = MODEL_VARIANT, model_path: Optional[Path] = None):
+    """
+    모델 변형별 ONNX 세션 생성 (스레드 수는 추론 executor 크기에 맞춤)
+    - optimized / int8: 첫 로드 때 최적화된 그래프를 저장하고,
+      다음부터는 저장된 그래프를 최적화 단계 없이 바로 로드
+    """
+    if variant not in MODEL_VARIANTS:
+        raise ValueError(f"지원하지 않는 모델 변형입니다: {variant}")
+
+    model_path = model_path or CACHE_DIR / "model.onnx"
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = ORT_INTRA_OP_THREADS
+    options.inter_op_num_threads = ORT_INTER_OP_THREADS
+
+    if variant == "int8":
+        model_path = _quantized_model_path(model_path)
+
+    tmp_path = None
+    if variant != "fp32":
+        optimized_path = _optimized_path(model_path)
+        if optimized_path.exists():
+            model_path = optimized_path
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        else:
+            logs.event(logger, logging.INFO, "최적화 그래프 생성 → 디스크에 저장", path=str(optimized_path))
+            tmp_path = _temp_path(optimized_path)
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.optimized_model_filepath = str(tmp_path)
+
+    session = ort.InferenceSession(
+        str(model_path),
+        sess_options=options,
+        providers=["CPUExecutionProvider"]
+    )
+    if tmp_path is not None and tmp_path.exists():
+        os.replace(tmp_path, optimized_path)
+    return session
+
 
 
 # =========================
@@ -128,132 +301,714 @@ def calculate_sentiment_score(neg: float, neu: float, pos: float) -> Tuple[str,
 
 
 # =========================
-# 감성 분석 (ONNX 추론)
+# 키워드 기반 혼합 감정 보정
 # =========================
-def analyze_sentiment(text: str) -> Tuple[str, float, float]:
+# 역접 / 긍정 / 강한 부정 / 일반 부정 / 조건 키워드 사전 (import 시 한 번 컴파일)
+KEYWORD_RULES_PATH = os.getenv("SENTIMENT_KEYWORD_RULES", str(DEFAULT_RULES_PATH))
+keyword_matcher = KeywordMatcher.from_file(KEYWORD_RULES_PATH)
+
+
+def adjust_mixed_sentiment(
+    text: str, neg: float, neu: float, pos: float, counts: Optional[Dict[str, int]] = None
+) -> Tuple[float, float, float]:
     """
-    ONNX 모델을 사용한 감성분석 + 키워드 기반 보정
+    키워드로 혼합 감정을 감지해 (neg, neu, pos) 확률을 재조정
+    - counts: keyword_matcher.count(text) 결과 (배치에서 미리 계산한 경우)
     """
-    session, tokenizer = load_model()
+    if counts is None:
+        counts = keyword_matcher.count(text)
+
+    # 키워드 개수 카운트 (문맥 고려)
+    strong_negative_count = counts.get("strong_negative", 0)
+    positive_count = counts.get("positive", 0)
+    negative_count = counts.get("negative", 0)
+
+    has_contrast = counts.get("contrast", 0) > 0
+    has_conditional = counts.get("conditional", 0) > 0
+
+    # ===== 우선순위 판단 =====
+
+    # 1. 강한 부정 키워드가 2개 이상이면 무조건 부정으로 처리 (보정 안함)
+    if strong_negative_count >= 2:
+        # 모델 판단 그대로 사용 (보정하지 않음)
+        return neg, neu, pos
+
+    # 2. 혼합 감정 패턴 감지
+    is_mixed = False
+
+    # 패턴 1: 역접 접속사 존재
+    if has_contrast:
+        is_mixed = True
+
+    # 패턴 2: 긍정 + 부정 키워드 동시 존재 (개수로 판단)
+    if positive_count >= 1 and negative_count >= 1:
+        # 단, 부정이 압도적이면 혼합으로 보지 않음
+        if negative_count + strong_negative_count > positive_count * 2:
+            is_mixed = False
+        else:
+            is_mixed = True
+
+    # 패턴 3: 조건부 표현 + (긍정 또는 부정)
+    if has_conditional and (positive_count >= 1 or negative_count >= 1):
+        is_mixed = True
+
+    # 혼합 감정이 감지되면 확률 재조정
+    if is_mixed:
+        if pos > 0.6 or neg > 0.6:  # 한쪽이 60% 이상이면 보정
+            neu = 0.5
+            pos = 0.3
+            neg = 0.2
+
+    return neg, neu, pos
+
+
+# =========================
+# 배치 후처리 (벡터화)
+# =========================
+LABELS = ("부정", "중립", "긍정")
+_NEG, _NEU, _POS = range(3)
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    """
+    행별 softmax (리뷰 한 건씩 계산할 때와 같은 float32 연산 순서)
+    """
+    exp_logits = np.exp(logits - logits.max(axis=1, keepdims=True))
+    total = exp_logits[:, 0] + exp_logits[:, 1] + exp_logits[:, 2]
+    return exp_logits / total[:, None]
+
+
+def adjust_mixed_sentiment_batch(probs: np.ndarray, batch_counts: List[Dict[str, int]]) -> np.ndarray:
+    """
+    adjust_mixed_sentiment의 배치 버전: (N, 3) [neg, neu, pos] 확률 → 보정된 확률
+    """
+    counts = np.array(
+        [
+            [c.get(k, 0) for k in ("strong_negative", "positive", "negative", "contrast", "conditional")]
+            for c in batch_counts
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 5)
+    strong_negative, positive, negative, contrast, conditional = counts.T
+
+    # 긍정 + 부정 키워드가 함께 있으면 부정이 압도적이지 않을 때만 혼합
+    both = (positive >= 1) & (negative >= 1)
+    is_mixed = np.where(both, negative + strong_negative <= positive * 2, contrast > 0)
+    is_mixed |= (conditional > 0) & ((positive >= 1) | (negative >= 1))
+
+    neg, pos = probs[:, _NEG], probs[:, _POS]
+    # 강한 부정 키워드가 2개 이상이면 보정하지 않음
+    override = (strong_negative < 2) & is_mixed & ((pos > 0.6) | (neg > 0.6))
+
+    adjusted = probs.copy()
+    adjusted[override] = (0.2, 0.5, 0.3)
+    return adjusted
+
+
+def calculate_sentiment_score_batch(probs: np.ndarray):
+    """
+    calculate_sentiment_score의 배치 버전 → (라벨 인덱스, 신뢰도, 별점) 배열
+    - 조건은 위에서부터 먼저 맞는 것 하나만 적용 (if/elif 순서 그대로)
+    """
+    neg, neu, pos = probs[:, _NEG], probs[:, _NEU], probs[:, _POS]
+    ordered = np.sort(probs, axis=1)
+    confidence_gap = ordered[:, 2] - ordered[:, 1]
+
+    conditions = [
+        (pos > 0.25) & (neg > 0.25),   # 1. 혼합 감정
+        confidence_gap < 0.1,          # 2. 확률이 거의 비슷
+        (neu >= pos) & (neu >= neg),   # 3. 중립이 가장 높음
+        (pos > neu) & (pos > neg),     # 4. 긍정
+        (neg > neu) & (neg > pos),     # 5. 부정
+    ]
+    labels = np.select(conditions, [_NEU, _NEU, _NEU, _POS, _NEG], default=_NEU)
+    confidence = np.select(conditions, [neu, neu, neu, pos, neg], default=ordered[:, 2])
+    sentiment_score = np.select(
+        conditions, [3.0, 2.5, 3.0, 3.0 + pos * 2.0, 2.5 - neg * 1.0], default=2.5
+    )
+    return labels, confidence, sentiment_score
+
+
+def postprocess_batch(logits: np.ndarray, batch_counts: List[Dict[str, int]]):
+    """
+    (N, 3) logits + 리뷰별 키워드 개수 → ([(라벨, 신뢰도, 별점)], 보정된 확률)
+    - 리뷰별 softmax → adjust_mixed_sentiment → calculate_sentiment_score와 결과가 같음
+    - 반올림은 Python round로 (np.round와 경계값 처리가 다름)
+    """
+    probs = _softmax(logits).astype(np.float64)
+    probs = adjust_mixed_sentiment_batch(probs, batch_counts)
+    labels, confidence, sentiment_score = calculate_sentiment_score_batch(probs)
+
+    results = [
+        (LABELS[label], round(conf, 3), round(score, 2))
+        for label, conf, score in zip(labels.tolist(), confidence.tolist(), sentiment_score.tolist())
+    ]
+    return results, probs
+
+
+# =========================
+# 동적 패딩 / 길이 버킷
+# =========================
+def _bucket_for(length: int) -> int:
+    for bucket in LENGTH_BUCKETS:
+        if length <= bucket:
+            return bucket
+    return LENGTH_BUCKETS[-1]
+
+
+def _bucket_batches(lengths: np.ndarray) -> List[List[int]]:
+    """
+    토큰 길이가 비슷한 리뷰끼리 묶은 인덱스 목록 (버킷당 최대 MAX_BATCH_SIZE개)
+    - 짧은 리뷰가 긴 리뷰와 같은 배치에 들어가 256 토큰까지 패딩되는 것을 방지
+    """
+    buckets = {}
+    for i, length in enumerate(lengths.tolist()):
+        buckets.setdefault(_bucket_for(length), []).append(i)
+
+    batches = []
+    for bucket in sorted(buckets):
+        indices = buckets[bucket]
+        for start in range(0, len(indices), MAX_BATCH_SIZE):
+            batches.append(indices[start:start + MAX_BATCH_SIZE])
+    return batches
+
+
+def _encode(tokenizer, texts: List[str]) -> dict:
+    """
+    배치 토크나이징 → int64 NumPy 배열 (배치 내 최장 길이까지 패딩) + 리뷰별 토큰 수
+    - fast 토크나이저는 배치 전체를 Rust에서 한 번에 처리
+    """
+    encodings = tokenizer(
+        texts,
+        truncation=True,
+        max_length=MAX_SEQ_LENGTH,
+        padding="longest",
+        return_tensors="np",
+    )
+    encoded = {
+        name: np.asarray(encodings[name], dtype=np.int64)  # 이미 int64면 복사 없음
+        for name in ("input_ids", "attention_mask", "token_type_ids")
+    }
+    encoded["lengths"] = encoded["attention_mask"].sum(axis=1)
+    return encoded
+
+
+# =========================
+# 재사용 입출력 버퍼 (IOBinding)
+# =========================
+INPUT_NAMES = ("input_ids", "attention_mask", "token_type_ids")
+NUM_LABELS = 3  # (부정, 중립, 긍정)
+
+
+class _IOBuffers:
+    """
+    세션 하나 + 추론 스레드 하나 전용 입출력 버퍼
+    - 길이 버킷마다 MAX_BATCH_SIZE × 버킷 길이짜리 평평한 int64 버퍼를 미리 잡아 두고
+      (행 수 × 실제 길이) 만큼만 잘라 연속 메모리 뷰로 사용 → 패딩은 기존과 동일
+    - IOBinding으로 버퍼 주소를 직접 넘겨 ONNX Runtime이 입력을 복사하거나 출력을 새로 만들지 않음
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.binding = session.io_binding()
+        self.output_name = session.get_outputs()[0].name
+
+        # 버킷보다 긴 입력은 마지막 버킷에 들어가므로 최대 길이까지 수용
+        capacities = {bucket: bucket for bucket in LENGTH_BUCKETS}
+        capacities[LENGTH_BUCKETS[-1]] = max(LENGTH_BUCKETS[-1], MAX_SEQ_LENGTH)
+        self.inputs = {
+            bucket: {
+                name: np.zeros(MAX_BATCH_SIZE * capacity, dtype=np.int64)
+                for name in INPUT_NAMES
+            }
+            for bucket, capacity in capacities.items()
+        }
+        self.output = np.zeros(MAX_BATCH_SIZE * NUM_LABELS, dtype=np.float32)
+
+    def run(self, encoded: dict, indices: List[int]) -> np.ndarray:
+        """
+        선택된 리뷰들을 그중 가장 긴 길이까지만 채워 추론 → logits 뷰 (다음 호출 때 덮어씀)
+        """
+        rows = len(indices)
+        length = int(encoded["lengths"][indices].max())
+        buffers = self.inputs[_bucket_for(length)]
+
+        for name in INPUT_NAMES:
+            view = buffers[name][:rows * length].reshape(rows, length)
+            np.take(encoded[name][:, :length], indices, axis=0, out=view)
+            self.binding.bind_input(
+                name, "cpu", 0, np.int64, view.shape, view.ctypes.data
+            )
+
+        logits = self.output[:rows * NUM_LABELS].reshape(rows, NUM_LABELS)
+        self.binding.bind_output(
+            self.output_name, "cpu", 0, np.float32, logits.shape, logits.ctypes.data
+        )
+        self.session.run_with_iobinding(self.binding)
+        return logits
+
+
+_local = threading.local()
+
+
+def _io_buffers(session) -> _IOBuffers:
+    """현재 스레드의 세션별 버퍼 (처음 쓸 때 한 번 생성)"""
+    cached = getattr(_local, "buffers", None)
+    if cached is None or cached.session is not session:
+        cached = _local.buffers = _IOBuffers(session)
+    return cached
 
+
+# =========================
+# 감성 분석 (ONNX 배치 추론)
+# =========================
+def _stub_logits(texts: List[str]) -> np.ndarray:
+    """
+    스텁 모델: 텍스트 해시로 만든 [-3, 3] 범위 logits (같은 텍스트 → 항상 같은 결과)
+    """
+    digests = b"".join(
+        hashlib.blake2b(text.encode("utf-8"), digest_size=NUM_LABELS).digest() for text in texts
+    )
+    if STUB_LATENCY_MS > 0:
+        time.sleep(STUB_LATENCY_MS / 1000)
+    logits = np.frombuffer(digests, dtype=np.uint8).reshape(-1, NUM_LABELS)
+    return logits.astype(np.float32) / 42.5 - 3.0
+
+
+def _model_logits(texts: List[str], session=None, timings: Optional[dict] = None) -> np.ndarray:
+    """ONNX 추론 → (N, 3) logits (timings에 tokenize / onnx_run 시간 기록)"""
+    timings = {} if timings is None else timings
+    loaded_session, tokenizer = load_model()
+    if session is None:
+        session = loaded_session
+
+    if session is None:
+        raise RuntimeError("감성분석 모델이 로드되지 않았습니다.")
+
+    # 배치 토크나이징 → 길이 버킷별로 나눠 버킷 내 최장 길이까지만 사용
+    started = time.perf_counter()
+    encoded = _encode(tokenizer, texts)
+    timings["tokenize"] = time.perf_counter() - started
+
+    # ONNX 추론 (버킷 하나당 한 번, 스레드별 재사용 버퍼 사용)
+    started = time.perf_counter()
+    buffers = _io_buffers(session)
+    batch_logits = np.empty((len(texts), NUM_LABELS), dtype=np.float32)
+    for indices in _bucket_batches(encoded["lengths"]):
+        batch_logits[indices] = buffers.run(encoded, indices)
+    timings["onnx_run"] = time.perf_counter() - started
+    return batch_logits
+
+
+def _score_batch_timed(texts: List[str], session=None):
+    """
+    _score_batch + 단계별 소요 시간 {"tokenize", "onnx_run", "postprocess": 초}
+    - 프로세스 풀 워커는 시간을 결과와 함께 API 프로세스로 돌려보냄
+    """
+    timings = {}
+    if not texts:
+        return [], timings
+
+    # 텍스트 길이 제한 (메모리 절약)
+    texts = [text[:256] for text in texts]
+
+    if STUB_MODEL:
+        started = time.perf_counter()
+        batch_logits = _stub_logits(texts)
+        timings["onnx_run"] = time.perf_counter() - started
+    else:
+        batch_logits = _model_logits(texts, session, timings)
+
+    # 키워드 카테고리 개수 (텍스트당 한 번 훑기) + softmax / 키워드 보정 / 별점 계산을 배치 단위로
+    started = time.perf_counter()
+    batch_counts = keyword_matcher.count_many(texts)
+    results, probs = postprocess_batch(batch_logits, batch_counts)
+    timings["postprocess"] = time.perf_counter() - started
+
+    # 리뷰별 로그는 표본만 (큐에 넣고 바로 반환, 출력은 로그 스레드)
+    if logs.REVIEW_SAMPLE_RATE > 0 and logger.isEnabledFor(logging.INFO):
+        for i, (label, _, sentiment_score) in enumerate(results):
+            if logs.sample_review():
+                neg, neu, pos = probs[i].tolist()
+                logs.event(
+                    logger, logging.INFO, "감성분석",
+                    text=texts[i][:100], neg=round(neg, 3), neu=round(neu, 3), pos=round(pos, 3),
+                    label=label, score=sentiment_score,
+                )
+
+    return results, timings
+
+
+def _score_batch(texts: List[str], session=None) -> List[Tuple[str, float, float]]:
+    """
+    여러 리뷰를 길이 버킷별 배치 추론으로 감성분석 + 키워드 기반 보정
+    - session: 다른 모델 변형과 비교할 때만 지정 (기본은 로드된 세션)
+    - 모델 로드 실패 / 추론 오류는 예외로 올림 (기본값이 캐시되지 않도록)
+    """
+    results, timings = _score_batch_timed(texts, session)
+    if results:
+        metrics.record_batch(timings, results)
+    return results
+
+
+def stub_sentiment_batch(texts: List[str]) -> List[Tuple[str, float, float]]:
+    """
+    스텁 모델로 감성분석 (모델 로드 / 캐시 없이, 같은 텍스트 → 항상 같은 결과)
+    - 시드 데이터처럼 실제 채점이 필요 없는 대량 적재용
+    """
+    if not texts:
+        return []
+    texts = [text[:256] for text in texts]
+    results, _ = postprocess_batch(_stub_logits(texts), keyword_matcher.count_many(texts))
+    return results
+
+
+# =========================
+# 마이크로 배칭 스케줄러
+# =========================
+class BatchScheduler:
+    """
+    동시에 들어온 요청의 텍스트를 window_ms 동안(또는 max_batch_size까지) 모아
+    _score_batch 한 번으로 처리하고, 각 호출자에게 결과를 돌려줌
+    - 배치는 dispatch(texts) → Future로 실행 (추론 executor 또는 프로세스 풀)
+    - 빈 워커(slots)가 없으면 그동안 요청이 더 쌓여 배치가 커짐
+    """
+
+    def __init__(self, window_ms: float, max_batch_size: int, dispatch, slots: int):
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._dispatch = dispatch
+        self._slots = threading.Semaphore(slots)
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, text: str) -> Future:
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="sentiment-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        # 첫 요청이 올 때까지 대기 → 이후 window 동안 추가 요청 수집
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            self._slots.acquire()
+            batch = self._collect()
+            try:
+                done = self._dispatch([text for text, _ in batch])
+            except Exception as e:
+                done = Future()
+                done.set_exception(e)
+            done.add_done_callback(lambda done, batch=batch: self._resolve(batch, done))
+
+    def _resolve(self, batch: List[Tuple[str, Future]], done: Future):
+        self._slots.release()
+        try:
+            results = done.result()
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+# 추론 전용 executor (웹 서버 스레드 풀과 분리, 크기 제한)
+_inference_executor = ThreadPoolExecutor(
+    max_workers=INFERENCE_WORKERS, thread_name_prefix="sentiment-inference"
+)
+
+# 멀티 프로세스 모드면 executor 대신 워커 프로세스 풀에서 추론
+# (워커가 보낸 단계별 시간 / 모델 로드 시간은 이 프로세스의 메트릭에 기록)
+pool = (
+    InferencePool(
+        INFERENCE_PROCESSES,
+        INFERENCE_PROCESS_THREADS,
+        on_batch=metrics.record_batch,
+        on_ready=metrics.MODEL_LOAD_SECONDS.observe,
+    )
+    if INFERENCE_PROCESSES > 0
+    else None
+)
+_slots = INFERENCE_PROCESSES if pool is not None else INFERENCE_WORKERS
+
+
+def _dispatch(texts: List[str]) -> Future:
+    """텍스트 배치 하나를 추론 백엔드에 넘기고 결과 목록 Future 반환"""
+    if pool is not None:
+        return pool.submit(texts)
+    return _inference_executor.submit(_score_batch, texts)
+
+
+_scheduler = BatchScheduler(BATCH_WINDOW_MS, MAX_BATCH_SIZE, _dispatch, _slots)
+
+
+# 키워드 사전이 바뀌어도 결과가 달라지므로 사전 해시도 버전에 포함
+cache = SentimentCache(
+    f"{MODEL_VERSION}+rules-{keyword_matcher.digest}", CACHE_SIZE, CACHE_DB_PATH or None
+)
+
+
+# =========================
+# 사전 로드 / 워밍업
+# =========================
+_ready = threading.Event()
+
+
+def _synthetic_inputs(tokenizer, batch_size: int, length: int) -> dict:
+    """[CLS] + [UNK]... + [SEP] 로 length 토큰을 꽉 채운 워밍업 입력 (_encode 결과 형식)"""
+    input_ids = np.full((batch_size, length), tokenizer.unk_token_id, dtype=np.int64)
+    input_ids[:, 0] = tokenizer.cls_token_id
+    input_ids[:, -1] = tokenizer.sep_token_id
+    return {
+        "input_ids": input_ids,
+        "attention_mask": np.ones((batch_size, length), dtype=np.int64),
+        "token_type_ids": np.zeros((batch_size, length), dtype=np.int64),
+        "lengths": np.full(batch_size, length, dtype=np.int64),
+    }
+
+
+def _warmup_session(rounds: int) -> bool:
+    """
+    현재 프로세스의 모델 로드 + 길이 버킷별 워밍업 추론
+    - 첫 추론 때 생기는 그래프 최적화 / 메모리 할당 비용을 미리 치름
+    """
+    if STUB_MODEL:
+        _score_batch_timed(["워밍업용 리뷰입니다. 연출은 좋았지만 조금 아쉬웠어요."])
+        return True
+
+    session, tokenizer = load_model()
     if session is None:
-        return "중립", 0.5, 3.0
+        return False
+
+    # 토크나이저 / 키워드 매처 / 후처리까지 한 번 통과
+    # (메트릭에는 기록하지 않음)
+    _score_batch_timed(["워밍업용 리뷰입니다. 연출은 좋았지만 조금 아쉬웠어요."])
 
+    # 이 스레드의 버킷별 버퍼도 여기서 만들어 둠
+    buffers = _io_buffers(session)
+    for bucket in LENGTH_BUCKETS:
+        for batch_size in sorted({1, min(MAX_BATCH_SIZE, 8)}):
+            encoded = _synthetic_inputs(tokenizer, batch_size, bucket)
+            for _ in range(rounds):
+                buffers.run(encoded, list(range(batch_size)))
+    return True
+
+
+def _warmup_thread(barrier: threading.Barrier, rounds: int) -> bool:
+    # 모든 워밍업 작업이 자리를 잡을 때까지 스레드를 붙잡아 두어 작업마다 다른 스레드에서 실행되게 함
+    # (스레드가 덜 떠서 모이지 못하면 기다리지 않고 이 스레드만 워밍업)
     try:
-        # 텍스트 길이 제한 (메모리 절약)
-        text = text[:256]
-        
-        # 토크나이징
-        inputs = tokenizer(
-            text,
-            return_tensors="np",  # NumPy array로 반환
-            truncation=True,
-            max_length=256,
-            padding="max_length"
-        )
+        barrier.wait(timeout=5)
+    except threading.BrokenBarrierError:
+        pass
+    return _warmup_session(rounds)
 
-        # ONNX 추론
-        ort_inputs = {
-            "input_ids": inputs["input_ids"].astype(np.int64),
-            "attention_mask": inputs["attention_mask"].astype(np.int64),
-            "token_type_ids": inputs["token_type_ids"].astype(np.int64)
-        }
-        
-        ort_outputs = session.run(None, ort_inputs)
-        logits = ort_outputs[0][0]  # (batch_size, num_labels) → (num_labels,)
-        
-        # Softmax 계산
-        exp_logits = np.exp(logits - np.max(logits))
-        probs = exp_logits / exp_logits.sum()
-        
-        neg, neu, pos = probs.tolist()
-        
-        # ===== 키워드 기반 혼합 감정 보정 =====
-        
-        # 1. 역접 접속사
-        contrast_keywords = [
-            "하지만", "그러나", "다만", "그런데", "근데", "BUT", "but",
-            "오히려", "반면", "대신", "비록", "반대로", "아니라"
-        ]
-        
-        # 2. 긍정 키워드
-        positive_keywords = [
-            "좋", "최고", "훌륭", "멋지", "완벽", "감동", "재밌", "재미",
-            "화려", "압도", "대단", "멋", "환상", "끝내주", "굿", "좋아",
-            "즐", "만족", "추천", "볼만", "괜찮", "훌륭", "대박", "재미있",
-            "감명", "인상", "몰입", "수작", "명작", "일품", "예술", "탄탄", "짱"
-        ]
-        
-        # 3. 강한 부정 키워드 (이것들이 많으면 무조건 부정)
-        strong_negative_keywords = [
-            "조잡", "졸작", "최악", "형편없", "쓰레기", "망작", "실패",
-            "지루", "하품", "산만", "거슬리"
-        ]
-        
-        # 4. 일반 부정 키워드
-        negative_keywords = [
-            "아쉽", "아쉬움", "단점", "별로", "실망", "비슷", "뻔", 
-            "안", "못", "없", "나쁘", "평범", "무난", "그저", "그냥", "그럭저럭"
-        ]
-        
-        # 5. 조건/양보 표현
-        conditional_keywords = [
-            "~만", "조금", "약간", "다소", "어느정도", "나름"
+
+def warmup(rounds: int = WARMUP_ROUNDS) -> bool:
+    """
+    앱 시작 시 호출: 모델을 미리 로드하고 워밍업, 끝나면 is_ready()가 True
+    - 추론 executor 스레드마다 워밍업 (IOBinding 버퍼가 스레드별이라 첫 요청에서 만들지 않도록)
+    - 프로세스 풀 모드면 모든 워커가 각자 워밍업을 마칠 때까지 대기
+      (워커 모델 로드 실패 또는 WARMUP_TIMEOUT 초과 시 False)
+    """
+    started = time.perf_counter()
+
+    if pool is not None:
+        pool.start()
+        ok = pool.wait_ready(WARMUP_TIMEOUT)
+    else:
+        barrier = threading.Barrier(INFERENCE_WORKERS)
+        futures = [
+            _inference_executor.submit(_warmup_thread, barrier, rounds)
+            for _ in range(INFERENCE_WORKERS)
         ]
-        
-        # 키워드 개수 카운트 (문맥 고려)
-        strong_negative_count = sum(1 for keyword in strong_negative_keywords if keyword in text)
-        positive_count = sum(1 for keyword in positive_keywords if keyword in text)
-        negative_count = sum(1 for keyword in negative_keywords if keyword in text)
-        
-        has_contrast = any(keyword in text for keyword in contrast_keywords)
-        has_conditional = any(keyword in text for keyword in conditional_keywords)
-        
-        # ===== 우선순위 판단 =====
-        
-        # 1. 강한 부정 키워드가 2개 이상이면 무조건 부정으로 처리 (보정 안함)
-        if strong_negative_count >= 2:
-            # 모델 판단 그대로 사용 (보정하지 않음)
-            pass
-        
-        # 2. 혼합 감정 패턴 감지
-        else:
-            is_mixed = False
-            
-            # 패턴 1: 역접 접속사 존재
-            if has_contrast:
-                is_mixed = True
-            
-            # 패턴 2: 긍정 + 부정 키워드 동시 존재 (개수로 판단)
-            if positive_count >= 1 and negative_count >= 1:
-                # 단, 부정이 압도적이면 혼합으로 보지 않음
-                if negative_count + strong_negative_count > positive_count * 2:
-                    is_mixed = False
-                else:
-                    is_mixed = True
-            
-            # 패턴 3: 조건부 표현 + (긍정 또는 부정)
-            if has_conditional and (positive_count >= 1 or negative_count >= 1):
-                is_mixed = True
-            
-            # 혼합 감정이 감지되면 확률 재조정
-            if is_mixed:
-                if pos > 0.6 or neg > 0.6:  # 한쪽이 60% 이상이면 보정
-                    neu = 0.5
-                    pos = 0.3
-                    neg = 0.2
-
-        # 감성 점수 계산
-        label, confidence, sentiment_score = calculate_sentiment_score(neg, neu, pos)
-
-        print(
-            f"리뷰: {text}\n"
-            f"✓ 감성분석 | "
-            f"NEG={neg:.3f} NEU={neu:.3f} POS={pos:.3f} → {label} (별점: {sentiment_score:.2f})"
+        ok = all([future.result() for future in futures])
+
+    if ok:
+        _ready.set()
+        logs.event(
+            logger, logging.INFO, "감성분석 모델 워밍업 완료",
+            seconds=round(time.perf_counter() - started, 1),
         )
+    else:
+        logs.event(logger, logging.ERROR, "감성분석 모델 워밍업 실패")
+    return ok
+
+
+def is_ready() -> bool:
+    # 프로세스 풀은 워커가 죽었다 다시 뜨는 동안 준비 상태가 바뀌므로 풀 상태를 그대로 따름
+    if pool is not None:
+        return pool.is_ready()
+    return _ready.is_set()
+
+
+# =========================
+# 감성 분석 (배치)
+# =========================
+def _batch_keys(texts: List[str]):
+    """텍스트별 (캐시 키, 정규화 텍스트)"""
+    normalized = [normalize_text(text) for text in texts]
+    return [cache.key(text) for text in normalized], normalized
+
+
+def _missing(keys, normalized, found) -> dict:
+    """캐시에 없어 추론이 필요한 {키: 정규화 텍스트} (중복 제거)"""
+    missing = {}
+    for key, text in zip(keys, normalized):
+        if key not in found:
+            missing.setdefault(key, text)
+    return missing
+
+
+async def _cache_get_async(keys) -> dict:
+    """
+    메모리 LRU는 바로 조회, 영구 캐시(SQLite)는 스레드에서 조회
+    (디스크 I/O / 추론 스레드와의 락 대기가 이벤트 루프의 다른 요청을 막지 않도록)
+    """
+    found, missing = cache.get_memory(keys)
+    if missing:
+        if cache.persistent:
+            found.update(await asyncio.to_thread(cache.get_disk, missing))
+        else:
+            cache.get_disk(missing)  # 미스 집계만
+    return found
+
+
+async def _cache_put_async(items: dict):
+    cache.put_memory(items)
+    if items and cache.persistent:
+        await asyncio.to_thread(cache.put_disk, items)
+
+
+def _submit_batch(missing: dict) -> List[Future]:
+    """
+    추론할 텍스트를 워커 수만큼 나눠 병렬로 넘김 (조각당 최소 MAX_BATCH_SIZE개)
+    """
+    texts = list(missing.values())
+    size = max(MAX_BATCH_SIZE, -(-len(texts) // _slots))
+    return [_dispatch(texts[start:start + size]) for start in range(0, len(texts), size)]
+
+
+def _scored_batch(missing: dict, futures: List[Future]) -> dict:
+    """완료된 Future들 → {키: 결과} (오류면 빈 dict → 기본값)"""
+    try:
+        results = [result for future in futures for result in future.result()]
+        return dict(zip(missing, results))
+    except Exception:
+        logs.event(logger, logging.ERROR, "감성분석 오류", exc_info=True)
+        return {}
+
+
+def analyze_sentiment_batch(texts: List[str]) -> List[Tuple[str, float, float]]:
+    """
+    여러 리뷰 감성분석
+    - 캐시에 없는 텍스트만 (중복 제거 후) 추론 executor에서 배치 추론
+    """
+    if not texts:
+        return []
+
+    keys, normalized = _batch_keys(texts)
+    found = cache.get_many(dict.fromkeys(keys))
+    missing = _missing(keys, normalized, found)
+    if missing:
+        scored = _scored_batch(missing, _submit_batch(missing))
+        cache.put_many(scored)
+        found.update(scored)
+    return [found.get(key, DEFAULT_RESULT) for key in keys]
+
+
+async def analyze_sentiment_batch_async(texts: List[str]) -> List[Tuple[str, float, float]]:
+    """analyze_sentiment_batch의 비동기 버전 (추론 / 영구 캐시 I/O 모두 이벤트 루프를 막지 않음)"""
+    if not texts:
+        return []
+
+    keys, normalized = _batch_keys(texts)
+    found = await _cache_get_async(dict.fromkeys(keys))
+    missing = _missing(keys, normalized, found)
+    if missing:
+        futures = _submit_batch(missing)
+        with contextlib.suppress(Exception):
+            # 완료 대기 (오류는 _scored_batch에서 처리)
+            await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+        scored = _scored_batch(missing, futures)
+        await _cache_put_async(scored)
+        found.update(scored)
+    return [found.get(key, DEFAULT_RESULT) for key in keys]
+
+
+# =========================
+# 감성 분석 (단건)
+# =========================
+def _submit(normalized: str) -> Future:
+    # 동시 요청은 스케줄러가 모아서 한 번에 추론 (window가 0이면 한 건씩)
+    return _scheduler.submit(normalized)
+
+
+def _result(future: Future) -> Optional[Tuple[str, float, float]]:
+    try:
+        return future.result()
+    except Exception:
+        logs.event(logger, logging.ERROR, "감성분석 오류", exc_info=True)
+        return None
+
+
+def analyze_sentiment(text: str) -> Tuple[str, float, float]:
+    """
+    ONNX 모델을 사용한 감성분석 + 키워드 기반 보정
+    - 캐시에 있으면 추론 생략
+    """
+    normalized = normalize_text(text)
+    key = cache.key(normalized)
+
+    found = cache.get_many([key])
+    if key in found:
+        return found[key]
+
+    result = _result(_submit(normalized))
+    if result is None:
+        return DEFAULT_RESULT
+    cache.put_many({key: result})
+    return result
+
+
+async def analyze_sentiment_async(text: str) -> Tuple[str, float, float]:
+    """analyze_sentiment의 비동기 버전 (추론 / 영구 캐시 I/O 모두 이벤트 루프를 막지 않음)"""
+    normalized = normalize_text(text)
+    key = cache.key(normalized)
 
-        return label, round(confidence, 3), round(sentiment_score, 2)
+    found = await _cache_get_async([key])
+    if key in found:
+        return found[key]
 
-    except Exception as e:
-        print(f"❌ 감성분석 오류: {e}")
-        return "중립", 0.5, 3.0
\ No newline at end of file
+    future = _submit(normalized)
+    with contextlib.suppress(Exception):
+        await asyncio.wrap_future(future)  # 완료 대기 (오류는 _result에서 처리)
+    result = _result(future)
+    if result is None:
+        return DEFAULT_RESULT
+    await _cache_put_async({key: result})
+    return result
@@ -0,0 +1,162 @@
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+Result = Tuple[str, float, float]
+
+
+# =========================
+# 캐시 키
+# =========================
+def normalize_text(text: str) -> str:
+    """
+    캐시 키용 정규화 (유니코드 NFC + 공백 정리)
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(normalized_text: str, model_version: str) -> str:
+    return hashlib.sha256(
+        f"{model_version}\0{normalized_text}".encode("utf-8")
+    ).hexdigest()
+
+
+# =========================
+# 감성분석 결과 캐시 (메모리 LRU + SQLite)
+# =========================
+class SentimentCache:
+    """
+    정규화된 리뷰 텍스트 + 모델 버전 해시 → (label, confidence, score)
+    - 1단계: 크기가 제한된 메모리 LRU
+    - 2단계(선택): 재시작 후에도 유지되는 SQLite 테이블
+    """
+
+    def __init__(self, model_version: str, max_size: int, db_path: Optional[str] = None):
+        self.model_version = model_version
+        self.max_size = max_size
+        self._memory: "OrderedDict[str, Result]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+                " key TEXT PRIMARY KEY,"
+                " label TEXT NOT NULL,"
+                " confidence REAL NOT NULL,"
+                " score REAL NOT NULL)"
+            )
+            self._db.commit()
+            self._db_lock = threading.Lock()
+
+    def key(self, normalized_text: str) -> str:
+        return cache_key(normalized_text, self.model_version)
+
+    @property
+    def persistent(self) -> bool:
+        return self._db is not None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Result]:
+        found, missing = self.get_memory(keys)
+        found.update(self.get_disk(missing))
+        return found
+
+    def get_memory(self, keys: Iterable[str]) -> Tuple[Dict[str, Result], List[str]]:
+        """메모리 LRU만 조회 → (적중 결과, 메모리에 없는 키)"""
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                result = self._memory.get(key)
+                if result is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = result
+            self.memory_hits += len(found)
+        return found, missing
+
+    def get_disk(self, keys: List[str]) -> Dict[str, Result]:
+        """
+        메모리에 없던 키를 SQLite에서 조회 (적중하면 메모리에도 올림)
+        - 디스크 I/O + 락 대기가 있으므로 이벤트 루프에서는 스레드로 넘겨 호출
+        """
+        found = {}
+        if keys and self._db is not None:
+            found = self._db_get_many(keys)
+            if found:
+                self._remember(found)
+        with self._lock:
+            self.disk_hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, Result]):
+        self.put_memory(items)
+        self.put_disk(items)
+
+    def put_memory(self, items: Dict[str, Result]):
+        if items:
+            self._remember(items)
+
+    def put_disk(self, items: Dict[str, Result]):
+        """SQLite에 저장 (get_disk와 마찬가지로 이벤트 루프에서는 스레드로 넘겨 호출)"""
+        if not items or self._db is None:
+            return
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO sentiment_cache (key, label, confidence, score)"
+                " VALUES (?, ?, ?, ?)",
+                [(key, *result) for key, result in items.items()],
+            )
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "model_version": self.model_version,
+                "size": len(self._memory),
+                "max_size": self.max_size,
+                "persistent": self._db is not None,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remember(self, items: Dict[str, Result]):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            for key, result in items.items():
+                self._memory[key] = result
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.max_size:
+                self._memory.popitem(last=False)
+
+    def _db_get_many(self, keys: List[str]) -> Dict[str, Result]:
+        found = {}
+        with self._db_lock:
+            # SQLite 바인드 변수 제한을 넘지 않도록 나눠서 조회
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._db.execute(
+                    "SELECT key, label, confidence, score FROM sentiment_cache"
+                    f" WHERE key IN ({placeholders})",
+                    chunk,
+                )
+                for key, label, confidence, score in rows:
+                    found[key] = (label, confidence, score)
+        return found
@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Iterable
+
+from sqlalchemy import insert, select, update
+
+from database import async_engine
+from models import DataVersion
+
+
+# =========================
+# 조건부 GET 설정 (환경 변수)
+# =========================
+# 요청 단위 쓰기는 프로세스 메모리 카운터로만 감지 (스크립트의 대량 쓰기는 DB 카운터로 감지)
+# → 여러 API 프로세스가 같은 DB에 쓰는 배포에서는 0으로 끔
+ETAGS_ENABLED = os.getenv("HTTP_ETAGS", "1") != "0"
+
+# DB의 공유 카운터(data_version)를 다시 읽는 주기 (초)
+# 시드 CLI 등 다른 프로세스의 쓰기는 최대 이 시간만큼 늦게 ETag에 반영
+HTTP_ETAG_SYNC_SECONDS = float(os.getenv("HTTP_ETAG_SYNC_SECONDS", "1"))
+
+# 0이면 매번 재검증 (no-cache), 양수면 그 시간(초) 동안 재검증 없이 사용
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+CACHE_CONTROL = (
+    f"max-age={HTTP_CACHE_MAX_AGE}, must-revalidate" if HTTP_CACHE_MAX_AGE > 0 else "no-cache"
+)
+
+
+# =========================
+# 버전 카운터
+# =========================
+# 프로세스가 새로 뜨면 이전 ETag가 모두 무효가 되도록 시작할 때마다 바뀌는 값
+EPOCH = uuid.uuid4().hex[:8]
+
+_lock = threading.Lock()
+_generation = 0  # 전체 재계산 등 모든 데이터가 바뀔 수 있는 경우
+_catalog = 0  # 영화 목록 (영화 추가 / 삭제, 영화 집계 변화)
+_movies: Dict[int, int] = {}  # 영화별 (영화 정보 / 집계 / 리뷰)
+_shared = 0  # DB의 data_version.generation (다른 프로세스의 대량 쓰기)
+_shared_checked = float("-inf")
+_shared_lock = asyncio.Lock()
+
+
+def bump_catalog():
+    """영화가 추가됐을 때 (다른 영화의 상세 / 리뷰는 그대로)"""
+    global _catalog
+    with _lock:
+        _catalog += 1
+
+
+def bump_movies(movie_ids: Iterable[int]):
+    """영화 또는 그 영화의 리뷰가 바뀌었을 때 (목록의 평점 / 리뷰 수도 바뀌므로 목록 포함)"""
+    global _catalog
+    with _lock:
+        for movie_id in set(movie_ids):
+            _movies[movie_id] = _movies.get(movie_id, 0) + 1
+        _catalog += 1
+
+
+def bump_all():
+    global _generation
+    with _lock:
+        _generation += 1
+
+
+# =========================
+# 공유 카운터 (DB)
+# =========================
+def bump_shared(db):
+    """
+    API 프로세스 밖에서 데이터를 바꿀 때 같은 트랜잭션 안에서 호출 (Session / Connection 모두 가능)
+    - 커밋되면 API 프로세스들이 HTTP_ETAG_SYNC_SECONDS 안에 읽어 모든 ETag를 바꿈
+    """
+    result = db.execute(
+        update(DataVersion).where(DataVersion.id == 1).values(generation=DataVersion.generation + 1)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(DataVersion).values(id=1, generation=1))
+
+
+async def refresh_shared():
+    """ETag 계산 전에 호출: 주기가 지났을 때만 DB 카운터를 읽음 (그 외에는 DB 커넥션을 쓰지 않음)"""
+    global _shared, _shared_checked
+    if time.monotonic() - _shared_checked < HTTP_ETAG_SYNC_SECONDS:
+        return
+    async with _shared_lock:
+        # 기다리는 동안 다른 요청이 이미 읽었으면 생략
+        if time.monotonic() - _shared_checked < HTTP_ETAG_SYNC_SECONDS:
+            return
+        async with async_engine.connect() as conn:
+            value = await conn.scalar(select(DataVersion.generation).where(DataVersion.id == 1))
+        _shared = value or 0
+        _shared_checked = time.monotonic()
+
+
+def _tag(key: str, *parts) -> str:
+    # 같은 리소스라도 쿼리 파라미터(정렬, 페이지 등)마다 응답이 다르므로 함께 해시
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=6).hexdigest()
+    return f'W/"{EPOCH}.{_generation}.{_shared}.{key}.{digest}"'
+
+
+def catalog_etag(*parts) -> str:
+    return _tag(f"c{_catalog}", *parts)
+
+
+def movie_etag(movie_id: int, *parts) -> str:
+    return _tag(f"m{movie_id}.{_movies.get(movie_id, 0)}", *parts)
+
+
+def matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더(여러 값 / * 가능)에 etag가 있는지"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
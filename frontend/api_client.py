@@ -0,0 +1,172 @@
+import collections
+import os
+import threading
+from typing import List, Optional
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+API = "https://movie-review-app-wmnz.onrender.com"
+#API = "http://localhost:8000"
+
+
+def _admin_token() -> str:
+    """백엔드의 ADMIN_TOKEN과 같은 값 (Streamlit secrets → 환경 변수 순, 없으면 빈 문자열)"""
+    try:
+        token = st.secrets.get("ADMIN_TOKEN", "")
+    except Exception:  # secrets.toml이 없을 때
+        token = ""
+    return token or os.getenv("ADMIN_TOKEN", "")
+
+
+# 비어 있으면 백엔드가 POST /admin/seed를 거부하므로 더미 데이터 버튼을 비활성화
+ADMIN_TOKEN = _admin_token()
+
+# (연결, 응답) 타임아웃 (초) - Render 콜드 스타트를 감안해 응답 대기는 길게
+TIMEOUT = (5, 60)
+
+# 엔드포인트별 캐시 유지 시간 (초) - 다른 사용자가 바꾼 내용은 이 시간 안에 반영
+CATALOG_TTL = 30
+MOVIE_TTL = 60
+REVIEWS_TTL = 30
+RECENT_TTL = 15
+
+
+# =========================
+# 공유 세션 (keep-alive)
+# =========================
+@st.cache_resource
+def _session() -> requests.Session:
+    """모든 사용자 세션 / 재실행이 같이 쓰는 연결 풀 (매 요청 TLS 핸드셰이크 없음)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _request(method: str, path: str, **kwargs):
+    """실패 응답은 requests.HTTPError (캐시에 남지 않음)"""
+    response = _session().request(method, f"{API}{path}", timeout=TIMEOUT, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+
+# =========================
+# 캐시 무효화 (리소스별 버전)
+# =========================
+# 캐시 함수에 버전을 인자로 넘겨, 쓰기 후 버전을 올리면 그 리소스 항목만 새로 조회
+# (프로세스 전역이라 같은 앱 서버의 다른 사용자 세션에도 바로 반영)
+_versions = collections.Counter()
+_versions_lock = threading.Lock()
+
+
+def _version(key) -> int:
+    return _versions[key]
+
+
+def _invalidate(*keys):
+    with _versions_lock:
+        for key in keys:
+            _versions[key] += 1
+
+
+def _invalidate_movie(movie_id: int):
+    """영화 / 그 영화의 리뷰가 바뀌었을 때 (목록 평점, 상세, 리뷰 목록, 최근 리뷰)"""
+    _invalidate("catalog", ("movie", movie_id), ("reviews", movie_id), "recent")
+
+
+# =========================
+# 조회 (캐시)
+# =========================
+@st.cache_data(ttl=CATALOG_TTL, max_entries=256, show_spinner=False)
+def _get_catalog(sort: str, limit: int, after: Optional[str], version: int) -> dict:
+    params = {"sort": sort, "limit": limit}
+    if after:
+        params["after"] = after
+    return _request("GET", "/catalog", params=params)
+
+
+def get_catalog(sort: str = "recent", limit: int = 12, after: Optional[str] = None) -> dict:
+    return _get_catalog(sort, limit, after, _version("catalog"))
+
+
+@st.cache_data(ttl=CATALOG_TTL, max_entries=16, show_spinner=False)
+def _get_movies(version: int) -> List[dict]:
+    return _request("GET", "/movies")
+
+
+def get_movies() -> List[dict]:
+    return _get_movies(_version("catalog"))
+
+
+@st.cache_data(ttl=MOVIE_TTL, max_entries=256, show_spinner=False)
+def _get_movie(movie_id: int, version: int) -> dict:
+    return _request("GET", f"/movies/{movie_id}")
+
+
+def get_movie(movie_id: int) -> dict:
+    return _get_movie(movie_id, _version(("movie", movie_id)))
+
+
+@st.cache_data(ttl=REVIEWS_TTL, max_entries=512, show_spinner=False)
+def _get_movie_reviews(movie_id: int, limit: int, after: Optional[str], version: int) -> dict:
+    params = {"limit": limit}
+    if after:
+        params["after"] = after
+    return _request("GET", f"/movies/{movie_id}/reviews", params=params)
+
+
+def get_movie_reviews(movie_id: int, limit: int = 10, after: Optional[str] = None) -> dict:
+    return _get_movie_reviews(movie_id, limit, after, _version(("reviews", movie_id)))
+
+
+@st.cache_data(ttl=RECENT_TTL, max_entries=16, show_spinner=False)
+def _get_recent_reviews(limit: int, version: int) -> dict:
+    return _request("GET", "/reviews", params={"limit": limit})
+
+
+def get_recent_reviews(limit: int = 10) -> dict:
+    return _get_recent_reviews(limit, _version("recent"))
+
+
+# =========================
+# 쓰기 (관련 캐시만 무효화)
+# =========================
+def create_movie(data: dict) -> dict:
+    movie = _request("POST", "/movies", json=data)
+    _invalidate("catalog")
+    return movie
+
+
+def delete_movie(movie_id: int):
+    try:
+        return _request("DELETE", f"/movies/{movie_id}")
+    finally:
+        _invalidate_movie(movie_id)
+
+
+def create_review(data: dict) -> dict:
+    review = _request("POST", "/reviews", json=data)
+    _invalidate_movie(data["movie_id"])
+    return review
+
+
+def delete_review(review_id: int, movie_id: int):
+    try:
+        return _request("DELETE", f"/reviews/{review_id}")
+    finally:
+        _invalidate_movie(movie_id)
+
+
+def seed_demo_data(movies: int = 5, reviews_per_movie: int = 10) -> dict:
+    """백엔드에서 샘플 영화 + 리뷰를 한 번에 생성 (POST /admin/seed, ADMIN_TOKEN 필요)"""
+    result = _request(
+        "POST", "/admin/seed",
+        json={"movies": movies, "reviews_per_movie": reviews_per_movie},
+        headers={"X-Admin-Token": ADMIN_TOKEN},
+    )
+    # 새 영화만 생기므로 목록 / 최근 리뷰만 무효화
+    _invalidate("catalog", "recent")
+    return result
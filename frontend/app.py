@@ -1,10 +1,8 @@
 import streamlit as st
 import requests
-import random
 from datetime import datetime
 
-API = "https://movie-review-app-wmnz.onrender.com"
-#API = "http://localhost:8000"
+import api_client as api
 
 st.set_page_config(page_title="Movie Review App", page_icon="🎬", layout="wide")
 
@@ -111,8 +109,26 @@ if "selected_movie" not in st.session_state:
 if "review_movie_id" not in st.session_state:
     st.session_state.review_movie_id = None
 
-if "review_page" not in st.session_state:
-    st.session_state.review_page = 0
+# 상세 화면 리뷰 페이지별 커서 (0번은 첫 페이지라 None, 서버에서 한 페이지씩 조회)
+REVIEWS_PER_PAGE = 10
+
+if "review_cursors" not in st.session_state:
+    st.session_state.review_cursors = [None]
+
+# 카탈로그 정렬 / 페이지별 커서 (0번은 첫 페이지라 None)
+CATALOG_PAGE_SIZE = 12
+CATALOG_SORTS = {
+    "최신 등록순": "recent",
+    "평점 높은 순": "score",
+    "리뷰 많은 순": "reviews",
+    "제목순": "title",
+}
+
+if "catalog_sort" not in st.session_state:
+    st.session_state.catalog_sort = "recent"
+
+if "catalog_cursors" not in st.session_state:
+    st.session_state.catalog_cursors = [None]
 
 # ---------------- Sidebar ----------------
 def sidebar_btn(label, value):
@@ -127,6 +143,7 @@ def sidebar_btn(label, value):
     if btn:
         st.session_state.menu = value
         st.session_state.selected_movie = None
+        st.session_state.review_cursors = [None]
         st.rerun()
 
     if is_active:
@@ -157,87 +174,61 @@ sidebar_btn("✍️ 리뷰 등록", "review_add")
 st.sidebar.markdown("---")
 
 # ---------------- Dummy Data ----------------
-if st.sidebar.button("더미 데이터 생성", use_container_width=True):
-    existing_titles = {m["title"] for m in requests.get(f"{API}/movies").json()}
-
-    movies = [
-        ("아바타: 불과 재", "2025-12-20", "제임스 카메론", "SF", "https://i.namu.wiki/i/UyN7wDQJ2QnXo-RivyWd573b1K-YZ9fAFUr0nyWMZLc_vd1NW45XQBBslwhUIfrHGyqSLIqryRYb9ItDci2hvc6C6TV1g822dsIAYcmw4VLWoPldfg-060N-9ua7vghptFaEAefg7sNzxvseXqsksg.webp"),
-        ("탈주", "2024-07-03", "이종필", "액션", "https://i.namu.wiki/i/GOCVqsctfY_ei_5gC38-8UlHqQ4ypixYpkfgGn_LcDsYpgelrJDMAlgxzrkwWZo0n0vnCcdgPgA7-_mNfScR5OkZuZU9JaGdNUZZyikeeUB19MlwR3VUdxaTjA4XHaUvyKP2LaGad9A4nVAi4ymAkg.webp"),
-        ("집으로 가는 길", "2013-12-12", "방은진", "드라마", "https://i.namu.wiki/i/O58yKrByuDlVcPA4TXIlytF98-4mBDnVGLloYTsQeqrkklOVqXkIR2rAySTDnLmWAb_Pe4VCSsVNEFDG4kWJOI4F9TrjcyL3DD26lpQBunOZaCl1z2DH5tjRABEyRXdMmcsUEYrryf--NoP9Ezd1lw.webp"),
-        ("전지적 독자 시점", "2025-07-23", "김병우", "판타지", "https://i.namu.wiki/i/78fa4oC92J13_-Z7Pw-_v_6TsLDJ2kBkTZqrfLm-ll9f_jgXP41H7UtUTXXCZpvTOZcIAsMqP3tsi6IfFvA2GFr8Cnto-mKubovE-MzWQeqcPVnG9LayEW46wv7UDm1lwnyYPxuiakPxi_LGLZccjQ.webp"),
-        ("극장판 짱구는 못말려: 초화려! 작열하는 떡잎마을 댄서즈", "2025-12-24", "하시모토 마사카즈", "애니메이션", "https://i.namu.wiki/i/yyOX12GcO3Z83hCYIxFvvjaUZnf9FshyOTeoT0s28URV1EhVWfDZ_349Mj6pyOQ3WuOK-oxRS9BHp_sP8hiZYq0aEGyMp8aNTlR6PwEGiZ4GNy_WtzkTC_i-PIha4yL5wusVyP5dsPhf3_aJ6zXWZg.webp"),
-    ]
-
-    for title, rd, d, g, p in movies:
-        if title in existing_titles:
-            continue
-        res = requests.post(f"{API}/movies", json={
-            "title": title,
-            "release_date": rd,
-            "director": d,
-            "genre": g,
-            "poster_url": p
-        })
-        mid = res.json()["id"]
-        KOREAN_REVIEWS = [
-            # 👍 매우 긍정
-            "스토리도 탄탄하고 연출이 정말 뛰어났어요. 시간 가는 줄 모르고 봤습니다.",
-            "배우들의 연기가 몰입감을 높여줘서 끝까지 재미있게 감상했어요.",
-            "영상미와 음악이 잘 어우러져서 극장에서 볼 가치가 충분한 작품이었습니다.",
-            "기대 이상으로 완성도가 높아서 다시 보고 싶은 영화예요.",
-
-            # 🙂 긍정
-            "전반적으로 재미있게 봤고, 몇몇 장면은 인상 깊었습니다.",
-            "조금 늘어지는 부분은 있었지만 전체적으로 만족스러웠어요.",
-            "가볍게 보기 좋은 영화라서 부담 없이 즐길 수 있었습니다.",
-
-            # 😐 중립
-            "무난한 영화였습니다. 나쁘지도 좋지도 않았어요.",
-            "스토리는 평범했지만 연출은 괜찮은 편이었습니다.",
-            "기대가 컸던 만큼 아쉬움도 조금 남는 작품이네요.",
-
-            # 🙁 부정
-            "스토리가 예상 가능해서 중간부터 흥미가 떨어졌습니다.",
-            "연출이 다소 산만해서 몰입하기 어려웠어요.",
-            "러닝타임에 비해 내용이 너무 얕게 느껴졌습니다.",
-
-            # 😡 매우 부정
-            "기대하고 봤는데 실망이 컸어요. 전개가 너무 엉성했습니다.",
-            "캐릭터의 행동이 이해되지 않아서 보는 내내 답답했어요.",
-            "끝까지 보기 힘들 정도로 지루했습니다."
-        ]
-
-        for i in range(10):
-            requests.post(f"{API}/reviews", json={
-                "movie_id": mid,
-                "author": f"user{i}",
-                "content": random.choice(KOREAN_REVIEWS)
-            })
-
-    st.sidebar.success("더미 데이터 생성 완료")
+if st.sidebar.button(
+    "더미 데이터 생성",
+    use_container_width=True,
+    disabled=not api.ADMIN_TOKEN,
+    help=None if api.ADMIN_TOKEN else "ADMIN_TOKEN(Streamlit secrets / 환경 변수)을 설정하면 사용할 수 있습니다.",
+):
+    # 샘플 영화 5편 + 영화당 리뷰 10개를 백엔드에서 한 번에 생성 (bulk insert + 배치 감성분석)
+    try:
+        api.seed_demo_data(movies=5, reviews_per_movie=10)
+    except requests.HTTPError as e:
+        if e.response.status_code == 403:
+            st.sidebar.error("❌ 관리자 토큰이 올바르지 않습니다.")
+        else:
+            st.sidebar.error("❌ 더미 데이터 생성 실패")
+    except requests.RequestException:
+        st.sidebar.error("❌ 더미 데이터 생성 실패")
+    else:
+        st.sidebar.success("더미 데이터 생성 완료")
 
 # ---------------- 영화 목록 ----------------
 if st.session_state.menu == "movie_list":
     if st.session_state.selected_movie is None:
         st.title("🎞 영화 목록")
-        res = requests.get(f"{API}/movies")
 
-        if res.status_code != 200:
-            st.error(f"/movies API 오류: {res.status_code}")
-            st.code(res.text)   # 👈 여기서 진짜 원인 보임
+        sort_labels = list(CATALOG_SORTS)
+        sort_label = st.selectbox(
+            "정렬",
+            sort_labels,
+            index=list(CATALOG_SORTS.values()).index(st.session_state.catalog_sort),
+        )
+        if CATALOG_SORTS[sort_label] != st.session_state.catalog_sort:
+            st.session_state.catalog_sort = CATALOG_SORTS[sort_label]
+            st.session_state.catalog_cursors = [None]
+
+        # 현재 페이지 카드 정보 + 평균 평점을 요청 한 번으로 조회 (캐시)
+        try:
+            catalog = api.get_catalog(
+                st.session_state.catalog_sort,
+                limit=CATALOG_PAGE_SIZE,
+                after=st.session_state.catalog_cursors[-1],
+            )
+        except requests.HTTPError as e:
+            st.error(f"/catalog API 오류: {e.response.status_code}")
+            st.code(e.response.text)   # 👈 여기서 진짜 원인 보임
             st.stop()
 
-        movies = res.json()
+        movies = catalog["items"]
 
         # ---------------- 목록 ----------------
         cols = st.columns(3)
 
         for idx, m in enumerate(movies):
-            reviews = requests.get(f"{API}/movies/{m['id']}/reviews").json()
-            if reviews:
-                avg_score = round(
-                    sum(r["sentiment_score"] for r in reviews) / len(reviews), 2
-                )
+            # 평균 평점은 백엔드 집계값 사용 (영화별 리뷰 조회 없음)
+            avg_score = m.get("avg_score")
+            if avg_score is not None:
                 avg_text = f"{score_to_stars(avg_score)} ({avg_score})"
             else:
                 avg_text = "📝 등록된 리뷰 없음"
@@ -276,6 +267,7 @@ if st.session_state.menu == "movie_list":
                 with button_col:
                     if st.button(title_escaped, key=f"title_{m['id']}", use_container_width=True):
                         st.session_state.selected_movie = m["id"]
+                        st.session_state.review_cursors = [None]
                         st.rerun()
                 
                 # 메타 정보와 삭제 버튼을 한 줄로
@@ -287,14 +279,38 @@ if st.session_state.menu == "movie_list":
                 
                 with del_col:
                     if st.button("🗑", key=f"del_{m['id']}", use_container_width=True):
-                        requests.delete(f"{API}/movies/{m['id']}")
+                        api.delete_movie(m["id"])
                         st.rerun()
                 
                 st.markdown("</div>", unsafe_allow_html=True)
+
+        # ---------------- 페이지 이동 ----------------
+        total_pages = max(1, (catalog["total"] + CATALOG_PAGE_SIZE - 1) // CATALOG_PAGE_SIZE)
+        page = len(st.session_state.catalog_cursors)
+        prev_col, page_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            if page > 1 and st.button("⬅️ 이전", use_container_width=True, key="catalog_prev"):
+                st.session_state.catalog_cursors.pop()
+                st.rerun()
+        with page_col:
+            st.markdown(f"<div style='text-align: center; padding-top: 8px;'><b>페이지 {page} / {total_pages}</b></div>", unsafe_allow_html=True)
+        with next_col:
+            if catalog["next_cursor"] and st.button("다음 ➡️", use_container_width=True, key="catalog_next"):
+                st.session_state.catalog_cursors.append(catalog["next_cursor"])
+                st.rerun()
     else:
         # ---------------- 상세 ----------------
-        movie = requests.get(f"{API}/movies/{st.session_state.selected_movie}").json()
-        reviews = requests.get(f"{API}/movies/{movie['id']}/reviews").json()
+        movie = api.get_movie(st.session_state.selected_movie)
+        # 현재 페이지 리뷰 10개 + 전체 리뷰 수 + 평균 평점만 조회
+        page = api.get_movie_reviews(
+            movie["id"], limit=REVIEWS_PER_PAGE, after=st.session_state.review_cursors[-1]
+        )
+        reviews = page["items"]
+
+        # 마지막 페이지의 리뷰를 모두 지웠으면 이전 페이지로
+        if not reviews and len(st.session_state.review_cursors) > 1:
+            st.session_state.review_cursors.pop()
+            st.rerun()
 
         st.title(movie["title"])
         
@@ -308,10 +324,8 @@ if st.session_state.menu == "movie_list":
             else:
                 st.warning("⚠️ 유효한 포스터 URL이 없습니다.")
 
-        if reviews:
-            avg_score = round(
-                sum(r["sentiment_score"] for r in reviews) / len(reviews), 2
-            )
+        avg_score = page["avg_score"]
+        if avg_score is not None:
             avg_text = f"{score_to_stars(avg_score)} ({avg_score})"
         else:
             avg_text = "📝 등록된 리뷰 없음"
@@ -336,13 +350,8 @@ if st.session_state.menu == "movie_list":
         
         if reviews:
             # 페이지네이션 설정
-            reviews_per_page = 10
-            total_pages = (len(reviews) + reviews_per_page - 1) // reviews_per_page
-            
-            # 현재 페이지 리뷰 계산
-            start_idx = st.session_state.review_page * reviews_per_page
-            end_idx = start_idx + reviews_per_page
-            page_reviews = reviews[start_idx:end_idx]
+            total_pages = max(1, (page["total"] + REVIEWS_PER_PAGE - 1) // REVIEWS_PER_PAGE)
+            page_number = len(st.session_state.review_cursors)
 
             cols = st.columns([1, 5, 1.5, 1, 1])
             
@@ -359,7 +368,7 @@ if st.session_state.menu == "movie_list":
             
             st.divider()
             
-            for r in page_reviews:
+            for r in reviews:
                 cols = st.columns([1, 5, 1.5, 1, 1])
                 
                 with cols[0]:
@@ -367,38 +376,39 @@ if st.session_state.menu == "movie_list":
                 with cols[1]:
                     st.markdown(r["content"])
                 with cols[2]:
-                    score = round(r["sentiment_confidence"], 2) if "sentiment_confidence" in r else round(r["sentiment_score"], 2)
+                    score = round(r["sentiment_confidence"], 2) if r.get("sentiment_confidence") is not None else "-"
                     st.markdown(r["sentiment_label"] + " (" + str(score) + ")")
                 with cols[3]:
                     st.markdown(str(r["sentiment_score"]))
                 with cols[4]:
                     if st.button("🗑️", key=f"delete_review_{r['id']}", help="삭제"):
-                        response = requests.delete(f"{API}/reviews/{r['id']}")
-                        if response.status_code == 200:
+                        try:
+                            api.delete_review(r["id"], movie["id"])
+                        except requests.RequestException:
+                            st.error("❌ 삭제 실패")
+                        else:
                             st.success("✅ 리뷰가 삭제되었습니다.")
                             st.rerun()
-                        else:
-                            st.error("❌ 삭제 실패")
 
             # 페이지 네비게이션
             st.divider()
             page_col1, page_col2, page_col3, page_col4 = st.columns([1, 2, 1, 1])
             
             with page_col1:
-                if st.session_state.review_page > 0:
+                if page_number > 1:
                     if st.button("⬅️ 이전", use_container_width=True):
-                        st.session_state.review_page -= 1
+                        st.session_state.review_cursors.pop()
                         st.rerun()
                 else:
                     st.write("")
             
             with page_col2:
-                st.markdown(f"<div style='text-align: center; padding-top: 8px;'><b>페이지 {st.session_state.review_page + 1} / {total_pages}</b></div>", unsafe_allow_html=True)
+                st.markdown(f"<div style='text-align: center; padding-top: 8px;'><b>페이지 {page_number} / {total_pages}</b></div>", unsafe_allow_html=True)
             
             with page_col3:
-                if st.session_state.review_page < total_pages - 1:
+                if page["next_cursor"]:
                     if st.button("다음 ➡️", use_container_width=True):
-                        st.session_state.review_page += 1
+                        st.session_state.review_cursors.append(page["next_cursor"])
                         st.rerun()
                 else:
                     st.write("")
@@ -410,7 +420,7 @@ if st.session_state.menu == "movie_list":
         
         if st.button("← 목록으로"):
             st.session_state.selected_movie = None
-            st.session_state.review_page = int(0)
+            st.session_state.review_cursors = [None]
             st.session_state.review_movie_id = None
             st.rerun()
 
@@ -428,7 +438,7 @@ elif st.session_state.menu == "movie_add":
                 release_str = release
             else:
                 release_str = release.strftime("%Y-%m-%d")
-            requests.post(f"{API}/movies", json={
+            api.create_movie({
                 "title": title,
                 "release_date": release_str,
                 "director": director,
@@ -440,7 +450,7 @@ elif st.session_state.menu == "movie_add":
 # ---------------- 리뷰 등록 ----------------
 elif st.session_state.menu == "review_add":
     st.title("✍️ 리뷰 등록")
-    movies = requests.get(f"{API}/movies").json()
+    movies = api.get_movies()
 
     # 영화가 없는 경우
     if not movies:
@@ -465,7 +475,7 @@ elif st.session_state.menu == "review_add":
 
         if st.button("등록"):
             if author and content:
-                requests.post(f"{API}/reviews", json={
+                api.create_review({
                     "movie_id": movie_map[movie],
                     "author": author,
                     "content": content
@@ -477,7 +487,7 @@ elif st.session_state.menu == "review_add":
 
     # 최근 리뷰
     st.markdown("### 🕒 최근 리뷰")
-    reviews = requests.get(f"{API}/reviews").json()
+    reviews = api.get_recent_reviews()["items"]
     
     if not reviews:
         st.info("등록된 리뷰가 없습니다.")
@@ -486,6 +496,6 @@ elif st.session_state.menu == "review_add":
             "영화 ID": r["movie_id"],
             "리뷰": r["content"],
             "감성": r["sentiment_label"],
-            "감성분석점수": round(r["sentiment_confidence"], 2) if "sentiment_confidence" in r else round(r["sentiment_score"], 2),
+            "감성분석점수": round(r["sentiment_confidence"], 2) if r.get("sentiment_confidence") is not None else None,
             "평점": r["sentiment_score"]
         } for r in reviews], use_container_width=True)
\ No newline at end of file